@@ -0,0 +1,361 @@
+# backend/core/alerts.py
+"""
+가격 도달 알림 엔진.
+
+사용자/클라이언트가 종목별로 "가격 이상(above) / 이하(below)" 알림을 등록하면
+종목마다 기준가 순으로 정렬된 목록(SortedList)에 넣어두고, 시세가 갱신될 때마다(on_price)
+새 가격을 넘어선 구간만 잘라내 발송한다. 알림 수가 아무리 많아도 tick 당 비용은
+O(log n + 발송 건수) 이며 발송 건수도 ALERT_MAX_FIRES_PER_TICK 로 제한된다 (남은 건 다음 tick).
+
+발송은 두 가지:
+- webhook_url 이 있으면 백그라운드 스레드가 JSON POST (재시도 포함, ALERT_WEBHOOK_HOSTS 로 허용한 호스트만)
+- 클라이언트별 수신함 → /api/v1/alerts/stream (Server-Sent Events) 로 push
+
+알림은 한 번 발송되면 삭제된다(one-shot). 시세 갱신은 유니버스/상세 요청 흐름에서도 오지만,
+알림이 걸린 종목은 ALERT_POLL_SECONDS 마다 캐시 경유로 직접 확인한다.
+"""
+import ipaddress
+import itertools
+import os
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+from urllib.parse import urlsplit, urlunsplit
+
+from sortedcontainers import SortedList
+
+from core.lazy_modules import _requests
+from core.metrics import ALERT_DELIVERIES, ALERTS_TRIGGERED
+
+ALERT_POLL_SECONDS = int(os.getenv("ALERT_POLL_SECONDS", "30"))
+ALERT_POLL_CHUNK = int(os.getenv("ALERT_POLL_CHUNK", "50"))  # 한 번에 시세를 요청할 종목 수
+ALERT_MAX_FIRES_PER_TICK = int(os.getenv("ALERT_MAX_FIRES_PER_TICK", "1000"))
+ALERT_MAX_PER_CLIENT = int(os.getenv("ALERT_MAX_PER_CLIENT", "200"))
+ALERT_INBOX_SIZE = int(os.getenv("ALERT_INBOX_SIZE", "100"))  # 클라이언트별 push 대기 이벤트 수
+# 남은 알림이 없는 클라이언트의 수신함을 보관하는 시간(초). 그 안에 SSE 로 다시 붙으면 받아갈 수 있다
+ALERT_INBOX_TTL = int(os.getenv("ALERT_INBOX_TTL", "3600"))
+ALERT_WEBHOOK_QUEUE = int(os.getenv("ALERT_WEBHOOK_QUEUE", "10000"))
+ALERT_WEBHOOK_WORKERS = int(os.getenv("ALERT_WEBHOOK_WORKERS", "2"))
+ALERT_WEBHOOK_RETRIES = 3
+# 쉼표로 구분한 webhook 허용 호스트. 비어 있으면 webhook 은 받지 않는다.
+# "*" 는 공인 IP 로만 풀리는 모든 호스트 허용 (루프백/사설/링크로컬/예약 대역은 등록·발송 때 모두 거절).
+# 이때 발송은 확인한 IP 로 직접 접속하므로 확인 뒤 DNS 가 바뀌어도(rebinding) 내부 주소로 가지 않는다
+ALERT_WEBHOOK_HOSTS = {h.strip().lower() for h in os.getenv("ALERT_WEBHOOK_HOSTS", "").split(",") if h.strip()}
+CONDITIONS = ("above", "below")
+
+
+class _Alert:
+    __slots__ = ("id", "ticker", "condition", "price", "client_id", "webhook_url", "note", "created_at")
+
+    def __init__(self, alert_id, ticker, condition, price, client_id, webhook_url, note):
+        self.id = alert_id
+        self.ticker = ticker
+        self.condition = condition
+        self.price = price
+        self.client_id = client_id
+        self.webhook_url = webhook_url
+        self.note = note
+        self.created_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "ticker": self.ticker,
+            "condition": self.condition,
+            "price": self.price,
+            "client_id": self.client_id,
+            "webhook_url": self.webhook_url,
+            "note": self.note,
+            "created_at": self.created_at,
+        }
+
+
+class _Book:
+    """종목 하나의 알림 목록. (기준가, id) 정렬."""
+
+    __slots__ = ("above", "below")
+
+    def __init__(self):
+        self.above = SortedList()  # price >= 기준가 면 발송
+        self.below = SortedList()  # price <= 기준가 면 발송
+
+
+def _public_address(host: str) -> Optional[str]:
+    """호스트가 가리키는 주소가 모두 공인 IP 면 그중 첫 주소, 아니면(DNS 조회 실패 포함) None."""
+    try:
+        infos = socket.getaddrinfo(host, None)
+    except (OSError, UnicodeError):
+        return None
+    addresses = [ipaddress.ip_address(info[4][0].split("%")[0]) for info in infos]
+    if not addresses or not all(addr.is_global and not addr.is_multicast for addr in addresses):
+        return None
+    return str(addresses[0])
+
+
+def _check_webhook_host(url: str) -> Optional[str]:
+    """
+    허용 목록에 직접 적힌 호스트는 그대로 통과(None), "*" 로 허용된 호스트는 공인 IP 일 때만 통과하고
+    발송 때 접속할 그 IP 를 돌려준다. 아니면 ValueError.
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    if host in ALERT_WEBHOOK_HOSTS:
+        return None
+    if "*" not in ALERT_WEBHOOK_HOSTS:
+        raise ValueError("webhook host is not allowed")
+    address = _public_address(host)
+    if address is None:
+        raise ValueError("webhook host must resolve to a public address")
+    return address
+
+
+def _post_webhook(requests, url: str, payload: Dict[str, Any], address: Optional[str]):
+    """
+    webhook POST. address 가 있으면 DNS 를 다시 보지 않고 그 IP 로 접속하되,
+    Host 헤더 / TLS SNI / 인증서 호스트 검증은 원래 호스트 이름으로 한다.
+    """
+    if address is None:
+        return requests.post(url, json=payload, timeout=5, allow_redirects=False)
+    parts = urlsplit(url)
+    netloc = f"[{address}]" if ":" in address else address
+    if parts.port:
+        netloc += f":{parts.port}"
+    adapter = requests.adapters.HTTPAdapter()
+    adapter.poolmanager.connection_pool_kw.update(server_hostname=parts.hostname, assert_hostname=parts.hostname)
+    with requests.Session() as session:
+        # 환경 프록시를 타면 프록시가 이름을 다시 풀게 되므로 쓰지 않는다
+        session.trust_env = False
+        session.mount("https://", adapter)
+        return session.post(
+            urlunsplit((parts.scheme, netloc, parts.path, parts.query, "")),
+            json=payload,
+            headers={"Host": parts.netloc.rpartition("@")[2]},
+            timeout=5,
+            allow_redirects=False,
+        )
+
+
+def _validate_webhook(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    if not ALERT_WEBHOOK_HOSTS:
+        raise ValueError("webhooks are disabled (ALERT_WEBHOOK_HOSTS is not set)")
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("webhook_url must be an http(s) URL")
+    _check_webhook_host(url)
+    return url
+
+
+class AlertEngine:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._seq = itertools.count(1)
+        self._alerts: Dict[int, _Alert] = {}
+        self._books: Dict[str, _Book] = {}
+        self._by_client: Dict[str, Set[int]] = {}
+        self._inbox: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._webhooks: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=ALERT_WEBHOOK_QUEUE)
+        self._fetch_prices: Optional[Callable[[List[str]], Dict[str, Optional[Dict]]]] = None
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+    # ---- 등록 / 조회 ----------------------------------------------------
+    def add(
+        self,
+        ticker: str,
+        condition: str,
+        price: float,
+        client_id: str,
+        webhook_url: Optional[str] = None,
+        note: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        if condition not in CONDITIONS:
+            raise ValueError(f"condition must be one of {list(CONDITIONS)}")
+        if not price or price <= 0:
+            raise ValueError("price must be positive")
+        if not client_id:
+            raise ValueError("client_id is required")
+        webhook_url = _validate_webhook(webhook_url)
+        ticker = ticker.upper()
+        with self._lock:
+            owned = self._by_client.setdefault(client_id, set())
+            if len(owned) >= ALERT_MAX_PER_CLIENT:
+                raise ValueError(f"too many alerts for client (max {ALERT_MAX_PER_CLIENT})")
+            alert = _Alert(next(self._ids), ticker, condition, float(price), client_id, webhook_url, note)
+            self._alerts[alert.id] = alert
+            owned.add(alert.id)
+            book = self._books.setdefault(ticker, _Book())
+            getattr(book, condition).add((alert.price, alert.id))
+        return alert.to_dict()
+
+    def _discard(self, alert: _Alert):
+        """잠금 안에서 호출. 알림을 모든 인덱스에서 제거."""
+        self._alerts.pop(alert.id, None)
+        owned = self._by_client.get(alert.client_id)
+        if owned is not None:
+            owned.discard(alert.id)
+            if not owned:
+                self._by_client.pop(alert.client_id, None)
+        book = self._books.get(alert.ticker)
+        if book is not None:
+            getattr(book, alert.condition).discard((alert.price, alert.id))
+            if not book.above and not book.below:
+                self._books.pop(alert.ticker, None)
+
+    def remove(self, alert_id: int, client_id: str) -> bool:
+        with self._lock:
+            alert = self._alerts.get(alert_id)
+            if alert is None or alert.client_id != client_id:
+                return False
+            self._discard(alert)
+            return True
+
+    def for_client(self, client_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            ids = sorted(self._by_client.get(client_id, ()))
+            return [self._alerts[i].to_dict() for i in ids]
+
+    def tickers(self) -> List[str]:
+        with self._lock:
+            return list(self._books)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "alerts": len(self._alerts),
+                "tickers": len(self._books),
+                "clients": len(self._by_client),
+                "inboxes": len(self._inbox),
+                "webhook_backlog": self._webhooks.qsize(),
+            }
+
+    # ---- 시세 반영 ------------------------------------------------------
+    def on_price(self, ticker: str, price: Optional[float]):
+        """새 시세로 넘어선 알림만 잘라내 발송. 알림 없는 종목은 dict 조회 한 번으로 끝난다."""
+        if not price or ticker not in self._books:
+            return
+        fired: List[_Alert] = []
+        with self._lock:
+            book = self._books.get(ticker)
+            if book is None:
+                return
+            # above: 기준가 <= price 인 앞쪽 구간
+            end = book.above.bisect_right((price, float("inf")))
+            for _, alert_id in book.above[: min(end, ALERT_MAX_FIRES_PER_TICK)]:
+                fired.append(self._alerts[alert_id])
+            # below: 기준가 >= price 인 뒤쪽 구간
+            room = ALERT_MAX_FIRES_PER_TICK - len(fired)
+            start = book.below.bisect_left((price, -1))
+            for _, alert_id in book.below[start : start + max(0, room)]:
+                fired.append(self._alerts[alert_id])
+            for alert in fired:
+                self._discard(alert)
+            now = time.time()
+            events = []
+            for alert in fired:
+                event = {**alert.to_dict(), "seq": next(self._seq), "triggered_price": price, "triggered_at": now}
+                events.append(event)
+                self._inbox.setdefault(alert.client_id, deque(maxlen=ALERT_INBOX_SIZE)).append(event)
+        for event in events:
+            ALERTS_TRIGGERED.labels(event["condition"]).inc()
+            if event["webhook_url"]:
+                try:
+                    self._webhooks.put_nowait(event)
+                except queue.Full:
+                    ALERT_DELIVERIES.labels("webhook", "dropped").inc()
+
+    def events_since(self, client_id: str, cursor: int) -> List[Dict[str, Any]]:
+        """SSE 용: 클라이언트 수신함에서 seq 가 cursor 보다 큰 이벤트."""
+        inbox = self._inbox.get(client_id)
+        if not inbox:
+            return []
+        with self._lock:
+            return [e for e in inbox if e["seq"] > cursor]
+
+    # ---- 백그라운드 ------------------------------------------------------
+    def _deliver(self, event: Dict[str, Any]):
+        requests = _requests()
+        payload = {k: v for k, v in event.items() if k != "webhook_url"}
+        try:
+            # 등록 이후 DNS 가 내부 주소로 바뀌었을 수 있으므로 발송 직전에 다시 확인하고, 확인한 IP 로만 접속
+            address = _check_webhook_host(event["webhook_url"])
+        except ValueError:
+            ALERT_DELIVERIES.labels("webhook", "blocked").inc()
+            return
+        for attempt in range(ALERT_WEBHOOK_RETRIES):
+            try:
+                r = _post_webhook(requests, event["webhook_url"], payload, address)
+                if r.status_code < 500:
+                    ALERT_DELIVERIES.labels("webhook", "ok" if r.status_code < 400 else "rejected").inc()
+                    return
+            except Exception:
+                pass
+            self._stop.wait(2 ** attempt)
+        ALERT_DELIVERIES.labels("webhook", "failed").inc()
+
+    def _webhook_loop(self):
+        while not self._stop.is_set():
+            try:
+                event = self._webhooks.get(timeout=1)
+            except queue.Empty:
+                continue
+            self._deliver(event)
+
+    def poll(self):
+        """알림이 걸린 종목 시세를 (캐시 경유로) 확인. 실제 반영은 가격 저장 시 on_price 훅에서 일어난다."""
+        if self._fetch_prices is None:
+            return
+        tickers = self.tickers()
+        for i in range(0, len(tickers), ALERT_POLL_CHUNK):
+            chunk = tickers[i : i + ALERT_POLL_CHUNK]
+            prices = self._fetch_prices(chunk) or {}
+            # 캐시 히트로 돌아온 값은 저장 훅을 거치지 않으므로 여기서 한 번 더 확인
+            for ticker, data in prices.items():
+                if data:
+                    self.on_price(ticker, data.get("price"))
+
+    def prune_inboxes(self, now: Optional[float] = None) -> int:
+        """남은 알림이 없고 마지막 발송이 ALERT_INBOX_TTL 보다 오래된 클라이언트의 수신함 삭제."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            idle = [
+                client_id
+                for client_id, inbox in self._inbox.items()
+                if client_id not in self._by_client and (not inbox or inbox[-1]["triggered_at"] < now - ALERT_INBOX_TTL)
+            ]
+            for client_id in idle:
+                del self._inbox[client_id]
+        return len(idle)
+
+    def _poll_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+                self.prune_inboxes()
+            except Exception as exc:
+                print(f"[Alerts] poll error: {exc}")
+            self._stop.wait(ALERT_POLL_SECONDS)
+
+    def start(self, fetch_prices: Callable[[List[str]], Dict[str, Optional[Dict]]]):
+        self._fetch_prices = fetch_prices
+        with self._lock:
+            if any(t.is_alive() for t in self._threads):
+                return
+            self._stop.clear()
+            self._threads = [threading.Thread(target=self._poll_loop, name="kobot-alerts", daemon=True)]
+            self._threads += [
+                threading.Thread(target=self._webhook_loop, name=f"kobot-alert-webhook-{i}", daemon=True)
+                for i in range(ALERT_WEBHOOK_WORKERS)
+            ]
+            for t in self._threads:
+                t.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+ALERTS = AlertEngine()
@@ -0,0 +1,119 @@
+# backend/core/deadline.py
+"""
+요청 단위 시간 예산(deadline).
+
+미들웨어가 start_request() 로 요청별 마감 시각을 열면, data_handler 의 외부 호출은
+남은 시간만큼만 timeout 을 잡고, 마감이 지난 뒤에는 외부 호출 대신 만료된 캐시 값(stale)을 쓴다.
+어떤 데이터가 stale 로 채워졌는지는 stale_parts() 로 모아 응답 헤더/본문에 표시한다.
+
+tracing 과 같은 contextvars 기반이라 run_in_threadpool 스레드까지 전파되며,
+직접 만든 executor 에서는 submit() 으로 컨텍스트를 넘겨야 한다.
+"""
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+_DEADLINE: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("kobot_deadline", default=None)
+_STALE: contextvars.ContextVar[Optional[Set[str]]] = contextvars.ContextVar("kobot_stale", default=None)
+
+# 요청 안에서 데이터 조회를 동시에 돌리고, 마감 이후 남은 작업(캐시 데우기)도 이어받는 공용 스레드
+DEADLINE_WORKERS = int(os.getenv("DEADLINE_WORKERS", "32"))
+_EXECUTOR = ThreadPoolExecutor(max_workers=DEADLINE_WORKERS, thread_name_prefix="kobot-deadline")
+
+
+class DeadlineExceeded(Exception):
+    """마감이 지나 외부 호출을 시작하지 않음."""
+
+
+def start_request(budget_s: Optional[float]) -> Tuple[contextvars.Token, contextvars.Token]:
+    deadline = time.monotonic() + budget_s if budget_s and budget_s > 0 else None
+    return _DEADLINE.set(deadline), _STALE.set(set())
+
+
+def finish_request(tokens: Tuple[contextvars.Token, contextvars.Token]) -> List[str]:
+    stale = sorted(_STALE.get() or ())
+    _DEADLINE.reset(tokens[0])
+    _STALE.reset(tokens[1])
+    return stale
+
+
+def remaining() -> Optional[float]:
+    """남은 시간(초). 마감이 없으면 None, 지났으면 0."""
+    deadline = _DEADLINE.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def expired() -> bool:
+    deadline = _DEADLINE.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def check():
+    if expired():
+        raise DeadlineExceeded()
+
+
+def cap_timeout(timeout: float) -> float:
+    """외부 호출 timeout 을 남은 시간 이하로 줄인다. 이미 지났으면 DeadlineExceeded."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded()
+    return min(timeout, left)
+
+
+def mark_stale(part: str):
+    stale = _STALE.get()
+    if stale is not None:
+        stale.add(part)
+
+
+def stale_parts() -> List[str]:
+    return sorted(_STALE.get() or ())
+
+
+def submit(fn: Callable, *args, **kwargs):
+    """현재 요청 컨텍스트(마감/tracing)를 유지한 채 공용 executor 에 작업 제출."""
+    ctx = contextvars.copy_context()
+    return _EXECUTOR.submit(ctx.run, fn, *args, **kwargs)
+
+
+def gather(
+    jobs: Dict[str, Tuple[Callable, tuple]],
+    fallback: Callable[[str], Any],
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    jobs 를 동시에 실행하고 마감까지 기다린다.
+    끝나지 않은 작업은 fallback(name) 값(보통 stale 캐시)으로 채우고 이름을 pending 으로 돌려준다.
+    남은 작업은 취소하지 않고 끝까지 돌아 캐시를 데우되, 그 안의 추가 외부 호출은 마감 때문에 생략된다.
+    """
+    futures = {name: submit(fn, *args) for name, (fn, args) in jobs.items()}
+    wait(futures.values(), timeout=remaining())
+    results: Dict[str, Any] = {}
+    pending: List[str] = []
+    for name, future in futures.items():
+        if not future.done():
+            # 여기 도달했다면 이미 마감이 지났으므로 fallback 은 외부 호출 없이 캐시만 본다
+            pending.append(name)
+            results[name] = fallback(name)
+        elif future.exception() is not None:
+            if isinstance(future.exception(), DeadlineExceeded):
+                pending.append(name)
+            results[name] = None
+        else:
+            results[name] = future.result()
+    return results, pending
+
+
+def run_with_budget(budget_s: Optional[float], fn: Callable, *args, **kwargs):
+    """요청 밖(백그라운드 갱신 등)에서 작업 하나에 시간 예산을 걸어 실행."""
+    tokens = start_request(budget_s)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        finish_request(tokens)
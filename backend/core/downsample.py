@@ -0,0 +1,66 @@
+# backend/core/downsample.py
+"""
+차트용 서버 측 다운샘플링.
+
+LTTB(Largest-Triangle-Three-Buckets)로 종가 곡선의 모양을 가장 잘 유지하는 봉을 고른 뒤,
+선택된 봉 사이 구간을 OHLCV 로 합쳐 고가/저가 꼬리가 사라지지 않게 한다.
+"""
+from typing import TYPE_CHECKING, Dict
+
+from core.lazy_modules import _np
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def lttb_indices(x: "np.ndarray", y: "np.ndarray", threshold: int) -> "np.ndarray":
+    """LTTB 로 남길 인덱스 (첫/마지막 점 포함, 오름차순)."""
+    np = _np()
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    # 첫/마지막 점을 제외한 나머지를 threshold-2 개 버킷으로 나눈다
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        # 다음 버킷의 평균점 (마지막 버킷은 끝점)
+        if i + 2 < len(edges):
+            nxt_start, nxt_end = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+            avg_x = x[nxt_start:nxt_end].mean()
+            avg_y = y[nxt_start:nxt_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        # 이전 선택점 a, 다음 버킷 평균점과 만드는 삼각형 넓이가 최대인 점
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_ohlcv(cols: Dict[str, "np.ndarray"], points: int) -> Dict[str, "np.ndarray"]:
+    """
+    columnar OHLCV(t/o/h/l/c/v) 를 약 points 개 봉으로 줄인다.
+    각 출력 봉은 선택된 봉부터 다음 선택 봉 직전까지를 합친 값 (o=처음, h=max, l=min, c=마지막, v=합).
+    """
+    np = _np()
+    n = len(cols["t"])
+    if points <= 0 or n <= points:
+        return cols
+    idx = lttb_indices(cols["t"], cols["c"], points)
+    ends = np.append(idx[1:], n)
+    return {
+        "t": cols["t"][idx],
+        "o": cols["o"][idx],
+        "h": np.maximum.reduceat(cols["h"], idx),
+        "l": np.minimum.reduceat(cols["l"], idx),
+        "c": cols["c"][ends - 1],
+        "v": np.add.reduceat(cols["v"], idx),
+    }
@@ -0,0 +1,228 @@
+# backend/core/history.py
+"""
+종목별 점수/행동(action)/가격 이력을 쌓는 append-only 시계열 저장소.
+
+유니버스 갱신과 상세 분석에서 새 점수가 나올 때마다 record() 로 한 건씩 덧붙인다.
+메모리에는 종목별로 고정 폭 컬럼(array.array: ts u32 / score u8 / action u8 / price f32 = 10 bytes)을
+두고, 시간순으로만 쌓이므로 범위 조회는 ts 컬럼 이분 탐색 + 슬라이스로 끝난다.
+
+디스크에는 같은 레코드를 12 bytes 고정 폭(ticker id u16 포함)으로 HISTORY_DIR/scores.bin 끝에
+덧붙이고, 종목 이름은 tickers.txt 에 id 순서대로 적는다. 시작 후 첫 사용 시 한 번 읽어 들이며,
+이때 보존 기간(HISTORY_RETENTION_DAYS)이 지난 레코드를 걸러 파일을 다시 쓴다.
+
+같은 종목은 행동이 바뀌지 않는 한 HISTORY_MIN_INTERVAL 초에 한 건만 남긴다
+(유니버스 1천 종목 x 장중 시간당 1건 x 6개월 ≈ 수 MB).
+"""
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.lazy_modules import _np
+
+HISTORY_PERSIST = os.getenv("HISTORY_PERSIST", "1") != "0"
+HISTORY_DIR = os.getenv("HISTORY_DIR") or str(Path(__file__).resolve().parent.parent / "data" / "history")
+HISTORY_MIN_INTERVAL = int(os.getenv("HISTORY_MIN_INTERVAL", "3600"))
+HISTORY_RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", "180"))
+
+# score_to_action 의 결과. 0 = 모름
+ACTIONS = ("", "STRONG BUY", "BUY", "HOLD", "WATCH")
+_RECORD = struct.Struct("<IHBBf")  # ts, ticker id, score, action, price
+_MAX_TICKERS = 0xFFFF
+
+
+class _Series:
+    """종목 하나의 컬럼. ts 오름차순."""
+
+    __slots__ = ("ts", "score", "action", "price")
+
+    def __init__(self):
+        self.ts = array("I")
+        self.score = array("B")
+        self.action = array("B")
+        self.price = array("f")
+
+    def append(self, ts: int, score: int, action: int, price: float):
+        self.ts.append(ts)
+        self.score.append(score)
+        self.action.append(action)
+        self.price.append(price)
+
+    def trim(self, cutoff: int):
+        i = bisect_left(self.ts, cutoff)
+        if i:
+            for col in (self.ts, self.score, self.action, self.price):
+                del col[:i]
+
+    def nbytes(self) -> int:
+        return sum(col.itemsize * len(col) for col in (self.ts, self.score, self.action, self.price))
+
+
+class HistoryStore:
+    def __init__(self, directory: str = HISTORY_DIR, persist: bool = HISTORY_PERSIST):
+        self._lock = threading.Lock()
+        self._dir = Path(directory)
+        self._persist = persist
+        self._loaded = False
+        self._series: Dict[str, _Series] = {}
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._records_file = None
+        self._names_file = None
+
+    # ---- 디스크 ---------------------------------------------------------
+    def _load(self):
+        """잠금 안에서 호출. 디스크 이력을 읽고 덧붙이기용 파일을 연다 (최초 1회)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self._persist:
+            return
+        records_path, names_path = self._dir / "scores.bin", self._dir / "tickers.txt"
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            if names_path.exists():
+                self._names = names_path.read_text(encoding="utf-8").splitlines()
+                self._ids = {name: i for i, name in enumerate(self._names)}
+            data = records_path.read_bytes() if records_path.exists() else b""
+            kept = self._load_records(data)
+            if len(kept) != len(data):
+                tmp = records_path.with_suffix(".tmp")
+                tmp.write_bytes(kept)
+                os.replace(tmp, records_path)
+            self._records_file = open(records_path, "ab")
+            self._names_file = open(names_path, "a", encoding="utf-8")
+            print(f"[History] {len(kept) // _RECORD.size} records / {len(self._series)} tickers 로딩")
+        except OSError as exc:
+            print(f"[History] {self._dir} 사용 불가, 메모리에만 저장: {exc}")
+            self._persist = False
+
+    def _load_records(self, data: bytes) -> bytes:
+        """디스크 레코드를 종목별 컬럼으로 나눠 담고, 보존할 레코드만 원래 순서대로 돌려준다."""
+        np = _np()
+        dtype = np.dtype([("ts", "<u4"), ("tid", "<u2"), ("score", "u1"), ("action", "u1"), ("price", "<f4")])
+        # 쓰다 끊긴 마지막 레코드는 버린다
+        records = np.frombuffer(data, dtype=dtype, count=len(data) // _RECORD.size)
+        cutoff = int(time.time()) - HISTORY_RETENTION_DAYS * 86400
+        records = records[(records["ts"] >= cutoff) & (records["tid"] < len(self._names))]
+        grouped = records[np.lexsort((records["ts"], records["tid"]))]
+        bounds = np.flatnonzero(np.diff(grouped["tid"])) + 1
+        for chunk in np.split(grouped, bounds) if len(grouped) else ():
+            series = self._series[self._names[int(chunk["tid"][0])]] = _Series()
+            series.ts.frombytes(np.ascontiguousarray(chunk["ts"], dtype="=u4").tobytes())
+            series.score.frombytes(np.ascontiguousarray(chunk["score"]).tobytes())
+            series.action.frombytes(np.ascontiguousarray(chunk["action"]).tobytes())
+            series.price.frombytes(np.ascontiguousarray(chunk["price"], dtype="=f4").tobytes())
+        return records.tobytes()
+
+    def load(self):
+        with self._lock:
+            self._load()
+
+    def _ticker_id(self, ticker: str) -> Optional[int]:
+        tid = self._ids.get(ticker)
+        if tid is None:
+            if len(self._names) >= _MAX_TICKERS:
+                return None
+            tid = self._ids[ticker] = len(self._names)
+            self._names.append(ticker)
+            if self._names_file is not None:
+                self._names_file.write(ticker + "\n")
+                self._names_file.flush()
+        return tid
+
+    # ---- 기록 / 조회 ----------------------------------------------------
+    def record(
+        self,
+        ticker: str,
+        score: Optional[int],
+        action: Optional[str] = None,
+        price: Optional[float] = None,
+        ts: Optional[float] = None,
+    ) -> bool:
+        """
+        점수 한 건을 덧붙인다. 직전 기록보다 이르거나, 행동이 같고 HISTORY_MIN_INTERVAL 안이면 건너뛴다.
+        """
+        if score is None or not ticker:
+            return False
+        ticker = ticker.upper()
+        ts = int(ts if ts is not None else time.time())
+        score = max(0, min(255, int(score)))
+        code = ACTIONS.index(action) if action in ACTIONS else 0
+        price = float(price) if price else float("nan")
+        with self._lock:
+            self._load()
+            series = self._series.get(ticker)
+            if series is not None and series.ts:
+                last = series.ts[-1]
+                if ts < last or (ts - last < HISTORY_MIN_INTERVAL and series.action[-1] == code):
+                    return False
+            tid = self._ticker_id(ticker)
+            if tid is None:
+                return False
+            if series is None:
+                series = self._series[ticker] = _Series()
+            series.append(ts, score, code, price)
+            # 보존 기간이 하루 이상 지난 앞부분은 한꺼번에 잘라낸다
+            cutoff = ts - HISTORY_RETENTION_DAYS * 86400
+            if series.ts[0] < cutoff - 86400:
+                series.trim(cutoff)
+            if self._records_file is not None:
+                try:
+                    self._records_file.write(_RECORD.pack(ts, tid, score, code, price))
+                    self._records_file.flush()
+                except OSError as exc:
+                    print(f"[History] 기록 실패, 메모리에만 저장: {exc}")
+                    self._records_file = None
+        return True
+
+    def query(
+        self,
+        ticker: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """[start, end] (epoch 초, 포함) 구간 이력. limit 이 있으면 가장 최근 limit 건."""
+        if start is not None and end is not None and start > end:
+            raise ValueError("start must be <= end")
+        ticker = ticker.upper()
+        with self._lock:
+            self._load()
+            series = self._series.get(ticker)
+            if series is None:
+                ts, score, action, price = [], [], [], []
+            else:
+                lo = bisect_left(series.ts, start) if start is not None else 0
+                hi = bisect_right(series.ts, end) if end is not None else len(series.ts)
+                if limit is not None and hi - lo > limit:
+                    lo = hi - limit
+                ts = series.ts[lo:hi].tolist()
+                score = series.score[lo:hi].tolist()
+                action = series.action[lo:hi].tolist()
+                price = series.price[lo:hi].tolist()
+        return {
+            "ticker": ticker,
+            "points": len(ts),
+            "t": ts,
+            "score": score,
+            "action": [ACTIONS[a] or None for a in action],
+            # f32 로 저장하므로 표시용으로 반올림, NaN(가격 없음) 은 None
+            "price": [None if p != p else round(p, 4) for p in price],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tickers": len(self._series),
+                "records": sum(len(s.ts) for s in self._series.values()),
+                "bytes": sum(s.nbytes() for s in self._series.values()),
+                "persist": self._records_file is not None,
+            }
+
+
+HISTORY = HistoryStore()
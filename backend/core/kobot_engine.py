@@ -1,29 +1,53 @@
 # backend/core/kobot_engine.py
+import json
+import os
 import random
+import re
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Tuple
+from pathlib import Path
+from typing import List, Dict, Optional, Sequence, Tuple
 
 from core.data_handler import (
     get_price,
+    get_prices,
     get_fundamentals,
     get_stock_profile,
     get_historical_candles,
     get_company_news,
+    get_market_snapshot,
+    NEWS_PIPELINE,
+    _yf_ticker,
 )
+from core import deadline, market_calendar
+from core.alerts import ALERTS
+from core.history import HISTORY
+from core.lazy_modules import preload_heavy_modules
+from core.metrics import record_cache, track_upstream
+from core.screener import SCREENER, parse_filters
+from core.search_index import SEARCH_INDEX
+from core.tracing import traced
+from core.universe import UniverseManager
+from core.warmup import WarmupPipeline
 
 ETF_TICKERS = {"SPY", "QQQ", "TQQQ", "SOXL", "ARKK", "VTI", "IWM", "DIA", "XLK"}
 ANALYSIS_CACHE: Dict[str, Dict] = {}
 ANALYSIS_TTL = 180  # 초 단위 캐시 TTL
-TOP_PICKS_CACHE: Dict[str, Dict] = {}
-TOP_PICKS_TTL = 120  # 전체 picks 캐시 TTL
-CANDIDATE_CACHE: Dict[str, Dict] = {}
-CANDIDATE_TTL = 600  # 10분마다 후보 리스트 리프레시
 TOP_PER_COUNTRY = 10  # 각 국가/ETF별 상위 개수
 SCORE_CACHE: Dict[str, Tuple[float, int]] = {}
 SCORE_TTL = 600  # 점수 계산 캐시
 TOP_WORKERS = 8  # 상위 종목 계산 시 동시 처리 스레드 수
+# S&P500 / KOSPI200 등 확장 유니버스 파일 (tickers.json 과 같은 US/KR/ETF 형식)
+UNIVERSE_FILE = os.getenv("UNIVERSE_FILE") or str(
+    Path(__file__).resolve().parent.parent / "config" / "universe.json"
+)
+# 1(기본)이면 검색 인덱스(listings.json + 유니버스)에 없는 종목은 분석 전에 바로 거절하고 추천만 돌려준다.
+# 0이면 인덱스에 없어도 심볼 형식만 맞으면 그대로 분석 (listings.json 밖의 종목을 열어둘 때)
+STRICT_TICKERS = os.getenv("STRICT_TICKERS", "1") != "0"
+# AAPL, BRK.B, 005930.KS, ^KS11, BTC-USD, EURUSD=X 형태
+_SYMBOL_RE = re.compile(r"^\^?[A-Z0-9][A-Z0-9.\-=]{0,19}$")
+_SEARCH_INDEX_LOCK = threading.Lock()
 
 
 def infer_country(ticker: str) -> str:
@@ -34,18 +58,26 @@ def infer_country(ticker: str) -> str:
     return "US"
 
 
-def calculate_score(ticker: str) -> int:
+@traced()
+def calculate_score(ticker: str) -> Optional[int]:
     """
     모멘텀 + 변동성 + 기본 펀더멘털을 반영한 점수.
     - 추세: MA20 > MA60, 최근 30/90일 수익률
     - 변동성/거래: 과도한 변동성 패널티, 최근 거래량 급증 보너스
     - 펀더멘털: PER/PBR/ROE/배당을 간단 반영
     - RSI: 과매수/과매도 구간 회피
+    요청 마감이 지나 계산하지 못하면 만료된 점수를, 그것도 없으면 None 을 반환.
     """
     now = time.time()
     cached = SCORE_CACHE.get(ticker.upper())
-    if cached and now - cached[0] < SCORE_TTL:
+    if cached and now < market_calendar.expires_at(ticker, cached[0], SCORE_TTL):
+        record_cache("score", "hit")
+        return cached[1]
+    if cached and deadline.expired():
+        record_cache("score", "stale")
+        deadline.mark_stale("score")
         return cached[1]
+    record_cache("score", "expired" if cached else "miss")
 
     try:
         def safe_float(x):
@@ -54,11 +86,13 @@ def calculate_score(ticker: str) -> int:
             except Exception:
                 return None
 
-        stock = __import__("yfinance").Ticker(ticker)
-        hist = stock.history(period="120d")
+        stock = _yf_ticker(ticker)
+        with track_upstream("yfinance", "calculate_score"):
+            hist = stock.history(period="120d")
         if len(hist) < 60:
             score_val = random.randint(62, 78)
             SCORE_CACHE[ticker.upper()] = (now, score_val)
+            SCREENER.update(ticker, country=infer_country(ticker), score=score_val)
             return score_val
 
         close = hist["Close"]
@@ -159,11 +193,31 @@ def calculate_score(ticker: str) -> int:
         # 소폭 랜덤으로 상위권 동점 해소
         score += random.randint(-3, 5)
         score_val = max(55, min(95, int(score)))
+        if deadline.expired() and all(v is None for v in fundamentals.values()):
+            # 마감 때문에 펀더멘털 없이 계산한 점수는 이번 응답에만 쓰고 캐시/스크리너에 남기지 않는다
+            deadline.mark_stale("score")
+            return score_val
         SCORE_CACHE[ticker.upper()] = (now, score_val)
+        # 스크리너 테이블에 점수와 함께 계산한 지표도 남긴다
+        SCREENER.update(
+            ticker,
+            country=infer_country(ticker),
+            score=score_val,
+            rsi=rsi_val,
+            volatility=vol,
+            return_30d=r30,
+        )
         return score_val
+    except deadline.DeadlineExceeded:
+        if cached:
+            record_cache("score", "stale")
+            deadline.mark_stale("score")
+            return cached[1]
+        return None
     except Exception:
         score_val = random.randint(65, 85)
         SCORE_CACHE[ticker.upper()] = (now, score_val)
+        SCREENER.update(ticker, country=infer_country(ticker), score=score_val)
         return score_val
 
 
@@ -186,6 +240,21 @@ def build_price_targets(price: float) -> Dict[str, float]:
         "stop_loss": round(price * 0.92, 2),
     }
 
+def register_target_alerts(ticker: str, client_id: str, webhook_url: Optional[str] = None) -> List[Dict]:
+    """
+    현재가 기준 build_price_targets 의 매수가(이하)/매도가(이상)/손절가(이하) 알림을 한 번에 등록.
+    시세를 구할 수 없으면 ValueError.
+    """
+    price_data = get_price(ticker)
+    if not price_data or not price_data.get("price"):
+        raise ValueError("price unavailable")
+    targets = build_price_targets(price_data["price"])
+    return [
+        ALERTS.add(ticker, condition, targets[key], client_id, webhook_url, note=key)
+        for key, condition in (("buy_price", "below"), ("sell_price", "above"), ("stop_loss", "below"))
+    ]
+
+@traced()
 def _build_candidate_item(ticker: str) -> Dict:
     """
     가격/점수/국가를 한 번에 계산해 반환.
@@ -194,49 +263,29 @@ def _build_candidate_item(ticker: str) -> Dict:
     try:
         price_data = get_price(ticker)
         score = calculate_score(ticker)
+        if score is None:
+            # 갱신 예산 안에 점수를 못 구했으면 랭킹의 기존 값을 유지
+            return {}
         country = infer_country(ticker)
+        price = price_data["price"] if price_data else 0
+        HISTORY.record(ticker, score, score_to_action(score), price)
         return {
             "ticker": ticker,
             "name": price_data.get("name", ticker) if price_data else ticker,
             "country": country,
             "score": score,
-            "price": price_data["price"] if price_data else 0,
+            "price": price,
             "change_pct": price_data.get("change_pct", 0) if price_data else 0,
         }
     except Exception:
         return {}
 
-def get_top_stocks() -> List[Dict]:
-    now = time.time()
-    cached_candidates = CANDIDATE_CACHE.get("all")
-    if cached_candidates and now - cached_candidates.get("_saved_at", 0) < CANDIDATE_TTL:
-        candidates = cached_candidates["data"]
-    else:
-        candidates = load_candidates_from_config()
-        CANDIDATE_CACHE["all"] = {"data": candidates, "_saved_at": now}
-
-    now = time.time()
-    cached = TOP_PICKS_CACHE.get("picks")
-    if cached and now - cached.get("_saved_at", 0) < TOP_PICKS_TTL:
-        return cached["data"]
-
-    buckets: Dict[str, List[Dict]] = {"US": [], "KR": [], "ETF": []}
-    workers = min(TOP_WORKERS, max(1, len(candidates)))
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = {executor.submit(_build_candidate_item, t): t for t in candidates}
-        for fut in as_completed(futures):
-            item = fut.result() or {}
-            country = item.get("country")
-            if country in buckets and item.get("ticker"):
-                buckets[country].append(item)
-
-    combined: List[Dict] = []
-    for country, items in buckets.items():
-        items_sorted = sorted(items, key=lambda x: x["score"], reverse=True)[:TOP_PER_COUNTRY]
-        combined.extend(items_sorted)
-
-    TOP_PICKS_CACHE["picks"] = {"data": combined, "_saved_at": now}
-    return combined
+def get_top_stocks() -> Sequence[Dict]:
+    """
+    유니버스 관리자가 백그라운드에서 유지하는 랭킹에서 국가/ETF별 상위 종목을 반환.
+    요청 시점에 전체 후보를 다시 계산하지 않는다.
+    """
+    return UNIVERSE.top_picks()
 
 
 def load_candidates_from_config() -> List[str]:
@@ -253,9 +302,6 @@ def load_candidates_from_config() -> List[str]:
         "SPY", "QQQ", "TQQQ", "SOXL", "ARKK", "VTI", "IWM", "DIA", "XLK",
     ]
     try:
-        import json
-        from pathlib import Path
-
         path = Path(__file__).resolve().parent.parent / "config" / "tickers.json"
         if not path.exists():
             return default_candidates
@@ -269,19 +315,119 @@ def load_candidates_from_config() -> List[str]:
     except Exception:
         return default_candidates
 
+def load_universe_from_config() -> List[str]:
+    """
+    기본 후보(tickers.json)에 UNIVERSE_FILE 의 확장 목록을 더한 전체 유니버스.
+    확장 파일이 없으면 기본 후보만 사용.
+    """
+    seed = load_candidates_from_config()
+    try:
+        path = Path(UNIVERSE_FILE)
+        if not path.exists():
+            return seed
+        with path.open() as f:
+            data = json.load(f) or {}
+        extra = (data.get("US") or []) + (data.get("KR") or []) + (data.get("ETF") or [])
+        return list(dict.fromkeys(seed + extra))
+    except Exception as exc:
+        print(f"[Universe] {UNIVERSE_FILE} 로딩 실패: {exc}")
+        return seed
+
+
+UNIVERSE = UniverseManager(
+    load_candidates=load_universe_from_config,
+    load_seed=load_candidates_from_config,
+    refresh_item=_build_candidate_item,
+    top_per_country=TOP_PER_COUNTRY,
+    workers=TOP_WORKERS,
+    bucket_of=infer_country,
+    prefetch=get_prices,
+)
+
+def _ensure_search_index():
+    """listings.json + 유니버스 심볼로 검색 인덱스를 한 번만 구축."""
+    if SEARCH_INDEX.loaded:
+        return
+    with _SEARCH_INDEX_LOCK:
+        if SEARCH_INDEX.loaded:
+            return
+        for ticker in load_universe_from_config():
+            SEARCH_INDEX.add(ticker, country=infer_country(ticker))
+        SEARCH_INDEX.load_listings()
+
+
+def screen_universe(
+    params: Dict[str, str],
+    country: Optional[str] = None,
+    sort: str = "score",
+    order: str = "desc",
+    limit: int = 50,
+) -> Dict:
+    """
+    캐시된 유니버스 값만으로 조건 검색 (외부 호출 없음).
+    params 의 {field}_min / {field}_max 를 필터로 사용. 잘못된 조건은 ValueError.
+    """
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be asc or desc")
+    filters = parse_filters(params)
+    return SCREENER.query(filters, country=country, sort=sort, descending=order == "desc", limit=limit)
+
+
+def search_tickers(query: str, limit: int = 10) -> List[Dict]:
+    _ensure_search_index()
+    return SEARCH_INDEX.search(query, limit)
+
+
+def resolve_ticker(ticker: str) -> Optional[str]:
+    """
+    분석 요청 전에 종목을 확인해 정식 심볼을 돌려준다 (005930 → 005930.KS, APPLE → AAPL).
+    모르는 종목이면 None (STRICT_TICKERS=0 이면 심볼 형식이 맞을 때 입력값(대문자) 그대로).
+    """
+    _ensure_search_index()
+    resolved = SEARCH_INDEX.resolve(ticker)
+    if resolved:
+        return resolved
+    symbol = ticker.strip().upper()
+    if SEARCH_INDEX.is_known(symbol):
+        return symbol
+    if not STRICT_TICKERS and _SYMBOL_RE.match(symbol):
+        return symbol
+    return None
+
+@traced()
 def analyze_and_recommend(ticker: str):
+    """
+    종목 상세 분석. 시세/점수/기업정보/펀더멘털/차트/뉴스를 동시에 조회하고,
+    요청 마감까지 끝나지 않은 항목은 만료된 캐시 값으로 채워 stale / pending 으로 표시한다.
+    """
     ticker_key = ticker.upper()
     now = time.time()
     cached = ANALYSIS_CACHE.get(ticker_key)
     if cached and now - cached.get("_saved_at", 0) < ANALYSIS_TTL:
+        record_cache("analysis", "hit")
         return {k: v for k, v in cached.items() if k != "_saved_at"}
-
-    price_data = get_price(ticker)
-    score = calculate_score(ticker)
+    record_cache("analysis", "expired" if cached else "miss")
+
+    jobs = {
+        "price": (get_price, (ticker,)),
+        "score": (calculate_score, (ticker,)),
+        "profile": (get_stock_profile, (ticker,)),
+        "fundamentals": (get_fundamentals, (ticker,)),
+        "historical": (get_historical_candles, (ticker,)),
+        "news": (get_company_news, (ticker,)),
+    }
+    # 마감까지 안 끝난 항목은 같은 함수를 다시 불러 채운다. 마감이 지난 컨텍스트라 외부 호출 없이 만료된 캐시만 본다.
+    parts, pending = deadline.gather(jobs, lambda name: jobs[name][0](*jobs[name][1]))
+    if deadline.expired():
+        # 끝났더라도 마감 때문에 값 없이 돌아온 항목(캐시도 없던 경우)은 pending 으로 본다
+        pending += [name for name, value in parts.items() if not value and name not in pending]
+
+    price_data = parts["price"]
+    score = parts["score"]
     current_price = price_data["price"] if price_data else None
     targets = build_price_targets(current_price)
 
-    profile = get_stock_profile(ticker)
+    profile = parts["profile"] or {}
     currency = (
         profile.get("currency")
         or (price_data.get("currency") if price_data else None)
@@ -289,13 +435,14 @@ def analyze_and_recommend(ticker: str):
     )
 
     recommendation_detail = {
-        "action": score_to_action(score),
+        "action": score_to_action(score) if score is not None else None,
         "buy_price": targets["buy_price"],
         "sell_price": targets["sell_price"],
         "stop_loss": targets["stop_loss"],
         "rationale": "가격 모멘텀과 밸류에이션을 종합한 자동 분석 결과입니다.",
     }
 
+    stale = deadline.stale_parts()
     result = {
         "ticker": ticker,
         "name": (price_data.get("name") if price_data else None) or ticker,
@@ -305,12 +452,43 @@ def analyze_and_recommend(ticker: str):
         "last_updated": datetime.utcnow().isoformat(),
         "country": infer_country(ticker),
         "currency": currency,
-        "fundamentals": get_fundamentals(ticker),
-        "historical": get_historical_candles(ticker),
-        "news": get_company_news(ticker),
+        "fundamentals": parts["fundamentals"] or {},
+        "historical": parts["historical"] or [],
+        "news": parts["news"] or [],
         "profile": profile,
         "source": price_data["source"] if price_data else "none",
+        "stale": stale,
+        "pending": pending,
     }
 
+    if stale or pending or score is None or current_price is None:
+        # 부분 결과는 캐시/랭킹/이력에 남기지 않는다. 남은 작업이 캐시를 데우면 다음 요청이 완전한 결과를 받는다.
+        return result
     ANALYSIS_CACHE[ticker_key] = {**result, "_saved_at": now}
+    HISTORY.record(ticker, score, recommendation_detail["action"], current_price)
+    # 상세 분석으로 새로 계산된 점수/가격을 picks 랭킹에도 바로 반영
+    UNIVERSE.update_item(
+        {
+            "ticker": ticker,
+            "name": result["name"],
+            "country": result["country"],
+            "score": score,
+            "price": current_price or 0,
+            "change_pct": price_data.get("change_pct", 0) if price_data else 0,
+        }
+    )
     return result
+
+
+# 콜드 스타트 대비 단계별 워밍업 (서버 시작 시 / keep-alive 핑의 /warmup 호출 시 백그라운드 실행)
+WARMUP = WarmupPipeline(
+    [
+        ("modules", preload_heavy_modules),
+        ("candidates", _ensure_search_index),
+        ("history", HISTORY.load),
+        ("snapshot", get_market_snapshot),
+        ("top_picks", get_top_stocks),
+        ("news", lambda: NEWS_PIPELINE.start(UNIVERSE.tickers)),
+        ("alerts", lambda: ALERTS.start(get_prices)),
+    ]
+)
@@ -0,0 +1,37 @@
+# backend/core/lazy_modules.py
+"""
+무거운 모듈 지연 로딩 접근자. 여러 core 모듈이 같은 함수를 import 해서 쓴다.
+"""
+import os
+from functools import lru_cache
+
+# yfinance(→ pandas) / numpy / requests 는 import 비용이 커서 콜드 스타트를 늦추므로
+# 모듈 로딩 시점이 아니라 처음 쓰일 때 불러온다.
+@lru_cache(maxsize=None)
+def _yf():
+    import certifi
+
+    # 명시적으로 CA 번들 경로를 지정 (curl_cffi / yfinance SSL 오류 방지)
+    os.environ.setdefault("CURL_CA_BUNDLE", certifi.where())
+    os.environ.setdefault("SSL_CERT_FILE", certifi.where())
+    import yfinance
+
+    return yfinance
+
+@lru_cache(maxsize=None)
+def _np():
+    import numpy
+
+    return numpy
+
+@lru_cache(maxsize=None)
+def _requests():
+    import requests
+
+    return requests
+
+def preload_heavy_modules():
+    """워밍업용: 지연 로딩 대상 모듈을 미리 불러온다."""
+    _requests()
+    _np()
+    _yf()
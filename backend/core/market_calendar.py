@@ -0,0 +1,213 @@
+# backend/core/market_calendar.py
+"""
+미국(NYSE) / 한국(KRX) 정규장 캘린더와 장 상태 기반 캐시 만료 계산.
+
+- 장중에는 캐시 TTL 을 MARKET_OPEN_TTL_FACTOR 배로 줄여 시세를 더 자주 갱신하고,
+- 장 마감 후 종가가 반영된 값(마감 + MARKET_SETTLE_SECONDS 이후 저장)은 다음 장 시작까지 유지한다.
+- 유니버스 스케줄러는 deferred_until() 로 장이 닫힌 시장 종목의 갱신을 다음 장 시작으로 미룬다.
+
+NYSE 정규 휴장일/조기 폐장은 규칙으로 계산하고, 음력 공휴일·대체공휴일·임시 휴장일은
+config/market_holidays.json 에서 읽는다 (MARKET_HOLIDAYS_FILE 로 변경 가능).
+"""
+import json
+import os
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+# 0이면 장 상태와 무관하게 기존 고정 TTL 사용
+ADAPTIVE_TTL = os.getenv("MARKET_ADAPTIVE_TTL", "1") != "0"
+OPEN_TTL_FACTOR = float(os.getenv("MARKET_OPEN_TTL_FACTOR", "0.5"))
+# 장 마감 후 종가/거래량이 확정될 때까지 기다리는 시간 (이전에 저장된 값은 평소 TTL 적용)
+SETTLE_SECONDS = int(os.getenv("MARKET_SETTLE_SECONDS", "900"))
+HOLIDAYS_FILE = os.getenv("MARKET_HOLIDAYS_FILE") or str(
+    Path(__file__).resolve().parent.parent / "config" / "market_holidays.json"
+)
+
+MARKETS: Dict[str, Dict] = {
+    "US": {"tz": ZoneInfo("America/New_York"), "open": dtime(9, 30), "close": dtime(16, 0), "early_close": dtime(13, 0)},
+    "KR": {"tz": ZoneInfo("Asia/Seoul"), "open": dtime(9, 0), "close": dtime(15, 30)},
+}
+# 신정, 삼일절, 근로자의 날, 어린이날, 현충일, 광복절, 개천절, 한글날, 성탄절, 연말 휴장일
+_KR_FIXED = [(1, 1), (3, 1), (5, 1), (5, 5), (6, 6), (8, 15), (10, 3), (10, 9), (12, 25), (12, 31)]
+_SEARCH_DAYS = 20  # 다음 개장/직전 마감을 찾을 때 살펴보는 최대 일수 (설/추석 연휴 포함)
+
+
+def market_for(ticker: str) -> str:
+    t = ticker.upper()
+    if t.endswith((".KS", ".KQ")) or t.startswith(("^KS", "^KQ")) or (len(t) == 6 and t.isdigit()):
+        return "KR"
+    return "US"
+
+
+@lru_cache(maxsize=None)
+def _extra_holidays() -> Dict[str, Set[date]]:
+    try:
+        with open(HOLIDAYS_FILE) as f:
+            data = json.load(f) or {}
+    except FileNotFoundError:
+        return {}
+    except Exception as exc:
+        print(f"[Calendar] {HOLIDAYS_FILE} 로딩 실패: {exc}")
+        return {}
+    return {
+        market: {date.fromisoformat(d) for d in days}
+        for market, days in data.items()
+        if market in MARKETS and isinstance(days, list)
+    }
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n 번째(음수면 뒤에서) 요일. weekday 는 월=0."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = (date(year, month + 1, 1) if month < 12 else date(year + 1, 1, 1)) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-n - 1))
+
+
+def _easter(year: int) -> date:
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(d: date) -> date:
+    """토요일 휴일은 금요일, 일요일 휴일은 월요일에 쉰다 (NYSE)."""
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+@lru_cache(maxsize=None)
+def _us_holidays(year: int) -> Set[date]:
+    days = {
+        _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),  # Presidents' Day
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _observed(date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),
+    }
+    # 신정이 토요일이면 전년도 12/31 에 쉬지 않는다 (NYSE 규칙)
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.add(_observed(new_year))
+    if year >= 2022:
+        days.add(_observed(date(year, 6, 19)))  # Juneteenth
+    return days | {d for d in _extra_holidays().get("US", ()) if d.year == year}
+
+
+@lru_cache(maxsize=None)
+def _kr_holidays(year: int) -> Set[date]:
+    days = {date(year, m, d) for m, d in _KR_FIXED}
+    return days | {d for d in _extra_holidays().get("KR", ()) if d.year == year}
+
+
+def _us_early_close(day: date) -> bool:
+    """독립기념일 전날, 추수감사절 다음날, 크리스마스 이브는 13시 조기 폐장."""
+    thanksgiving = _nth_weekday(day.year, 11, 3, 4)
+    return day in (date(day.year, 7, 3), thanksgiving + timedelta(days=1), date(day.year, 12, 24))
+
+
+@lru_cache(maxsize=4096)
+def session(market: str, day: date) -> Optional[Tuple[float, float]]:
+    """그 날짜(현지)의 정규장 (개장, 마감) epoch 초. 휴장일이면 None."""
+    if day.weekday() >= 5:
+        return None
+    holidays = _us_holidays(day.year) if market == "US" else _kr_holidays(day.year)
+    if day in holidays:
+        return None
+    cfg = MARKETS[market]
+    close = cfg["close"]
+    if market == "US" and _us_early_close(day):
+        close = cfg["early_close"]
+    opened = datetime.combine(day, cfg["open"], tzinfo=cfg["tz"])
+    closed = datetime.combine(day, close, tzinfo=cfg["tz"])
+    return opened.timestamp(), closed.timestamp()
+
+
+def _local_day(market: str, ts: float) -> date:
+    return datetime.fromtimestamp(ts, MARKETS[market]["tz"]).date()
+
+
+def is_open(market: str, ts: float) -> bool:
+    s = session(market, _local_day(market, ts))
+    return s is not None and s[0] <= ts < s[1]
+
+
+def last_close(market: str, ts: float) -> Optional[float]:
+    """ts 이전(포함) 가장 최근 정규장 마감 시각."""
+    day = _local_day(market, ts)
+    for offset in range(_SEARCH_DAYS):
+        s = session(market, day - timedelta(days=offset))
+        if s and s[1] <= ts:
+            return s[1]
+    return None
+
+
+def next_open(market: str, ts: float) -> Optional[float]:
+    """ts 이후 가장 가까운 정규장 개장 시각."""
+    day = _local_day(market, ts)
+    for offset in range(_SEARCH_DAYS):
+        s = session(market, day + timedelta(days=offset))
+        if s and s[0] > ts:
+            return s[0]
+    return None
+
+
+def deferred_until(ticker: str, ts: float) -> Optional[float]:
+    """
+    장이 닫혀 있고 마감 후 값이 이미 확정됐다면 다음 개장 시각, 아니면 None.
+    (이 시각 전까지는 새로 가져와도 값이 바뀌지 않는다)
+    """
+    if not ADAPTIVE_TTL:
+        return None
+    market = market_for(ticker)
+    if is_open(market, ts):
+        return None
+    closed_at = last_close(market, ts)
+    if closed_at is None or ts < closed_at + SETTLE_SECONDS:
+        return None
+    return next_open(market, ts)
+
+
+def expires_at(ticker: str, saved_at: float, ttl: float) -> float:
+    """
+    saved_at 에 저장된 시세성 캐시 값의 만료 시각.
+    장중 저장: ttl * OPEN_TTL_FACTOR / 마감 확정 후 저장: 다음 개장까지 / 그 외: ttl.
+    """
+    if not ADAPTIVE_TTL:
+        return saved_at + ttl
+    market = market_for(ticker)
+    if is_open(market, saved_at):
+        return saved_at + ttl * OPEN_TTL_FACTOR
+    resume = deferred_until(ticker, saved_at)
+    return max(saved_at + ttl, resume) if resume else saved_at + ttl
+
+
+def status(ts: Optional[float] = None) -> Dict[str, Dict]:
+    """시장별 현재 상태 (운영 확인용)."""
+    ts = ts if ts is not None else datetime.now(timezone.utc).timestamp()
+    result = {}
+    for market in MARKETS:
+        closed_at, opens_at = last_close(market, ts), next_open(market, ts)
+        result[market] = {
+            "open": is_open(market, ts),
+            "last_close": datetime.fromtimestamp(closed_at, timezone.utc).isoformat() if closed_at else None,
+            "next_open": datetime.fromtimestamp(opens_at, timezone.utc).isoformat() if opens_at else None,
+        }
+    return result
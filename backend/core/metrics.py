@@ -0,0 +1,117 @@
+# backend/core/metrics.py
+"""
+Prometheus 지표 정의와 기록 헬퍼.
+
+- 외부 소스(finnhub/alpha/yfinance/google_rss/yahoo_search)별 지연시간·에러
+- 캐시별 hit/miss/expired
+- run_in_threadpool 대기열 길이
+- picks 전체 갱신 시간, 시세 묶음 크기, 엔드포인트별 응답 시간
+- 가격 알림 발송/전달 결과
+"""
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# 외부 API는 수백 ms ~ 수십 초까지 걸리므로 넓은 버킷 사용
+_UPSTREAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 12, 20, 30)
+
+UPSTREAM_LATENCY = Histogram(
+    "kobot_upstream_latency_seconds",
+    "외부 데이터 소스 호출 지연시간",
+    ["provider", "function"],
+    buckets=_UPSTREAM_BUCKETS,
+)
+UPSTREAM_ERRORS = Counter(
+    "kobot_upstream_errors_total",
+    "외부 데이터 소스 호출 실패 수",
+    ["provider", "function", "reason"],
+)
+CACHE_EVENTS = Counter(
+    "kobot_cache_events_total",
+    "캐시 조회 결과 (hit / miss / expired)",
+    ["cache", "event"],
+)
+THREADPOOL_BORROWED = Gauge(
+    "kobot_threadpool_busy_threads",
+    "run_in_threadpool 에서 사용 중인 스레드 수",
+)
+THREADPOOL_WAITING = Gauge(
+    "kobot_threadpool_queue_depth",
+    "run_in_threadpool 스레드를 기다리는 작업 수",
+)
+THREADPOOL_TOTAL = Gauge(
+    "kobot_threadpool_size",
+    "run_in_threadpool 스레드 한도",
+)
+PICKS_REFRESH = Histogram(
+    "kobot_picks_refresh_seconds",
+    "picks 랭킹 갱신(유니버스 슬롯 1회) 소요 시간",
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+)
+QUOTE_BATCH_SIZE = Histogram(
+    "kobot_quote_batch_size",
+    "다종목 시세 묶음 요청 1회에 담긴 종목 수",
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+)
+ALERTS_TRIGGERED = Counter(
+    "kobot_alerts_triggered_total",
+    "가격 도달로 발송된 알림 수",
+    ["condition"],
+)
+ALERT_DELIVERIES = Counter(
+    "kobot_alert_deliveries_total",
+    "알림 전달 결과 (webhook ok / rejected / failed / dropped)",
+    ["channel", "result"],
+)
+HTTP_REQUEST_LATENCY = Histogram(
+    "kobot_http_request_duration_seconds",
+    "API 엔드포인트 응답 시간",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 45),
+)
+
+
+@contextmanager
+def track_upstream(provider: str, function: str):
+    """외부 호출 구간의 지연시간을 기록하고, 예외 발생 시 에러로 집계 후 다시 던진다."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as exc:
+        UPSTREAM_ERRORS.labels(provider, function, type(exc).__name__).inc()
+        raise
+    finally:
+        UPSTREAM_LATENCY.labels(provider, function).observe(time.perf_counter() - start)
+
+
+def record_upstream_error(provider: str, function: str, reason: str):
+    """예외 없이 실패한 응답 (HTTP 4xx/5xx, throttle 안내 등)을 집계."""
+    UPSTREAM_ERRORS.labels(provider, function, reason).inc()
+
+
+def record_cache(cache: str, event: str):
+    CACHE_EVENTS.labels(cache, event).inc()
+
+
+def observe_http(method: str, route: str, status: int, elapsed: float):
+    HTTP_REQUEST_LATENCY.labels(method, route, str(status)).observe(elapsed)
+
+
+def _update_threadpool_gauges():
+    try:
+        import anyio.to_thread
+
+        stats = anyio.to_thread.current_default_thread_limiter().statistics()
+        THREADPOOL_BORROWED.set(stats.borrowed_tokens)
+        THREADPOOL_WAITING.set(stats.tasks_waiting)
+        THREADPOOL_TOTAL.set(stats.total_tokens)
+    except Exception:
+        # 이벤트 루프 밖에서 호출된 경우 등
+        pass
+
+
+def render_latest():
+    """/metrics 응답 본문과 content-type 반환 (이벤트 루프 안에서 호출)."""
+    _update_threadpool_gauges()
+    return generate_latest(), CONTENT_TYPE_LATEST
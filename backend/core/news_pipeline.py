@@ -0,0 +1,198 @@
+# backend/core/news_pipeline.py
+"""
+백그라운드 뉴스 수집 파이프라인.
+
+사용자 요청 안에서 뉴스 소스를 하나씩 기다리는 대신, 유니버스 종목을 조금씩 나눠
+모든 소스를 동시에 폴링하고 결과를 종목별 링 버퍼에 쌓아둔다.
+같은 기사는 정규화한 URL / 제목 기준으로 소스를 넘어 한 번만 남긴다.
+상세 페이지의 뉴스 섹션은 latest() 메모리 조회로 끝난다.
+"""
+import contextvars
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+NEWS_POLL_SECONDS = int(os.getenv("NEWS_POLL_SECONDS", "60"))
+# 주기마다 폴링할 최소 종목 수. 실제로는 max_age 안에 유니버스를 한 바퀴 돌 수 있도록 늘린다
+NEWS_BATCH_SIZE = int(os.getenv("NEWS_BATCH_SIZE", "10"))
+NEWS_WORKERS = int(os.getenv("NEWS_WORKERS", "8"))
+NEWS_BUFFER_SIZE = int(os.getenv("NEWS_BUFFER_SIZE", "30"))  # 종목별 보관 기사 수
+NEWS_FETCH_LIMIT = 10  # 소스별 1회 요청 기사 수
+
+NewsSource = Callable[[str, int], List[Dict[str, Any]]]
+
+_TRACKING_PARAMS = re.compile(r"^(utm_|guccounter|guce_|ncid|fbclid|gclid|ocid|soc_)")
+_TITLE_STRIP = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_url(url: str) -> str:
+    """스킴/www/끝 슬래시/추적 파라미터 차이를 없앤 URL 키."""
+    try:
+        parts = urlsplit(url.strip())
+    except Exception:
+        return url
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(
+        sorted((k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k))
+    )
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def normalize_title(title: str, publisher: Optional[str] = None) -> str:
+    """대소문자/구두점과 구글 뉴스식 ' - 언론사' 접미사를 제거한 제목 키."""
+    title = title or ""
+    if publisher and title.endswith(f" - {publisher}"):
+        title = title[: -len(publisher) - 3]
+    elif " - " in title:
+        head, _, tail = title.rpartition(" - ")
+        if len(tail) <= 40:
+            title = head
+    return _TITLE_STRIP.sub("", title.lower())
+
+
+def published_ts(value: Any) -> float:
+    """epoch(int) / RFC822 / ISO 문자열을 epoch 초로. 알 수 없으면 0."""
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except Exception:
+        pass
+    try:
+        from datetime import datetime
+
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except Exception:
+        return 0.0
+
+
+class NewsPipeline:
+    def __init__(self, sources_for: Callable[[str], Sequence[Tuple[str, NewsSource]]], max_age: float):
+        self._sources_for = sources_for
+        self._max_age = max_age  # 버퍼를 최신으로 보는 시간 = 유니버스 한 바퀴 목표 시간
+        self._tickers: Optional[Callable[[], Sequence[str]]] = None
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._attempted: Dict[str, float] = {}  # 종목별 마지막 폴링 시도 시각 (배치 순서용, 실패 포함)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.polled_at: Dict[str, float] = {}  # 종목별 마지막 소스 확인 시각 (폴링 또는 직접 조회 후 ingest)
+
+    # ---- 저장 ----------------------------------------------------------
+    def ingest(self, ticker: str, items: List[Dict[str, Any]]) -> int:
+        """새 기사들을 종목 버퍼에 병합 (중복 제거, 최신순 유지). 새로 추가된 개수 반환."""
+        ticker = ticker.upper()
+        with self._lock:
+            self.polled_at[ticker] = time.time()
+            buffer = self._buffers.get(ticker) or deque(maxlen=NEWS_BUFFER_SIZE)
+            seen_urls = {normalize_url(it["link"]) for it in buffer}
+            seen_titles = {normalize_title(it["title"], it.get("publisher")) for it in buffer}
+            merged = list(buffer)
+            added = 0
+            for it in items:
+                if not it.get("title") or not it.get("link"):
+                    continue
+                url_key = normalize_url(it["link"])
+                title_key = normalize_title(it["title"], it.get("publisher"))
+                if url_key in seen_urls or (title_key and title_key in seen_titles):
+                    continue
+                seen_urls.add(url_key)
+                seen_titles.add(title_key)
+                merged.append(it)
+                added += 1
+            if added:
+                merged.sort(key=lambda it: published_ts(it.get("published_at")), reverse=True)
+                self._buffers[ticker] = deque(merged[:NEWS_BUFFER_SIZE], maxlen=NEWS_BUFFER_SIZE)
+            elif ticker not in self._buffers:
+                self._buffers[ticker] = buffer
+            return added
+
+    def latest(self, ticker: str, limit: int = 6, max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        """버퍼의 최신 기사. max_age 가 있으면 마지막 확인이 그보다 오래된 버퍼는 [] (폴링 대상에서 빠진 종목 등)."""
+        ticker = ticker.upper()
+        buffer = self._buffers.get(ticker)
+        if not buffer:
+            return []
+        if max_age is not None and time.time() - self.polled_at.get(ticker, 0) > max_age:
+            return []
+        with self._lock:
+            return list(buffer)[:limit]
+
+    # ---- 수집 ----------------------------------------------------------
+    def _fetch(self, ticker: str, source: NewsSource) -> Optional[List[Dict[str, Any]]]:
+        """소스 하나 호출. 실패(마감 초과 포함)면 None."""
+        try:
+            return source(ticker, NEWS_FETCH_LIMIT) or []
+        except Exception:
+            return None
+
+    def poll(self, tickers: Sequence[str]):
+        """
+        주어진 종목들의 모든 소스를 동시에 호출해 버퍼에 병합.
+        요청 안에서 부르면 마감/tracing 컨텍스트를 작업마다 넘겨 외부 호출이 남은 시간 안에서 끝난다.
+        """
+        jobs = [(t, src) for t in tickers for _, src in self._sources_for(t)]
+        if not jobs:
+            return
+        contexts = [contextvars.copy_context() for _ in jobs]
+        with ThreadPoolExecutor(max_workers=min(NEWS_WORKERS, len(jobs))) as executor:
+            results = list(executor.map(lambda job, ctx: (job[0], ctx.run(self._fetch, *job)), jobs, contexts))
+        now = time.time()
+        for ticker in tickers:
+            self._attempted[ticker.upper()] = now
+        for ticker, items in results:
+            if items:
+                self.ingest(ticker, items)
+            elif items is not None:
+                # 새 기사가 없어도 소스 확인에는 성공했으므로 버퍼는 최신
+                self.polled_at[ticker.upper()] = now
+
+    def _next_batch(self) -> List[str]:
+        """
+        마지막 폴링 시도가 가장 오래된 종목부터 (같으면 주어진 순서 = hot → warm → cold).
+        tier 가 바뀌어 목록 순서가 달라져도 건너뛰거나 반복하는 종목이 없다.
+        """
+        tickers = list(self._tickers() if self._tickers else [])
+        if not tickers:
+            return []
+        size = max(NEWS_BATCH_SIZE, math.ceil(len(tickers) * NEWS_POLL_SECONDS / max(self._max_age, 1)))
+        ranked = heapq.nsmallest(
+            size, ((self._attempted.get(t.upper(), 0.0), i, t) for i, t in enumerate(tickers))
+        )
+        return [t for _, _, t in ranked]
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.poll(self._next_batch())
+            except Exception as exc:
+                print(f"[News] poll error: {exc}")
+            self._stop.wait(NEWS_POLL_SECONDS)
+
+    def start(self, tickers: Callable[[], Sequence[str]]):
+        self._tickers = tickers
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="kobot-news", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,108 @@
+# backend/core/profiler.py
+"""
+관리자용 샘플링 프로파일러.
+
+arm(n) 으로 켜면 이후 n개 요청이 처리되는 동안 별도 스레드가
+sys._current_frames() 로 모든 스레드의 스택을 주기적으로 샘플링한다.
+(요청 처리는 run_in_threadpool / ThreadPoolExecutor 스레드에서 일어나므로
+ cProfile 처럼 한 스레드만 보는 방식으로는 잡히지 않는다.)
+결과는 collapsed stack 텍스트로 내려주며 speedscope / flamegraph.pl 로 바로 볼 수 있다.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+# 대기 중인 스레드(유휴 워커, 이벤트 루프 select 등)는 샘플에서 제외
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", "thread.py")
+MAX_STACK_DEPTH = 64
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._remaining = 0
+        self._active = 0
+        self._interval = 0.005
+        self._samples: Counter = Counter()
+        self._sample_count = 0
+        self._profiled_requests = 0
+        self._armed_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+
+    def arm(self, requests: int, interval_ms: float = 5.0) -> Dict:
+        with self._lock:
+            self._remaining = max(0, int(requests))
+            self._interval = max(0.001, interval_ms / 1000)
+            self._samples = Counter()
+            self._sample_count = 0
+            self._profiled_requests = 0
+            self._armed_at = time.time()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="kobot-profiler", daemon=True)
+                self._thread.start()
+        return self.status()
+
+    def begin_request(self) -> bool:
+        """프로파일 대상 요청이면 True. 반드시 end_request() 와 짝을 맞춘다."""
+        if self._remaining <= 0:
+            return False
+        with self._lock:
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            self._active += 1
+        self._wakeup.set()
+        return True
+
+    def end_request(self):
+        with self._lock:
+            self._active = max(0, self._active - 1)
+            self._profiled_requests += 1
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                "armed_at": self._armed_at,
+                "remaining_requests": self._remaining,
+                "active_requests": self._active,
+                "profiled_requests": self._profiled_requests,
+                "samples": self._sample_count,
+                "interval_ms": round(self._interval * 1000, 2),
+            }
+
+    def dump(self) -> str:
+        with self._lock:
+            lines = [f"{stack} {count}" for stack, count in self._samples.most_common()]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            if self._active <= 0:
+                self._wakeup.wait(timeout=1.0)
+                self._wakeup.clear()
+                continue
+            frames = sys._current_frames()
+            collected = []
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                if os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                collected.append(";".join(reversed(stack)))
+            with self._lock:
+                self._samples.update(collected)
+                self._sample_count += 1
+            time.sleep(self._interval)
+
+
+PROFILER = SamplingProfiler()
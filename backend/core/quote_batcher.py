@@ -0,0 +1,87 @@
+# backend/core/quote_batcher.py
+"""
+시세 조회 마이크로 배칭 (DataLoader 방식).
+
+picks 갱신 스레드, 동시에 들어온 상세 요청, 스냅샷 등이 각자 한 종목씩 get_price 를 부르면
+짧은 창(QUOTE_BATCH_WINDOW_MS) 동안 들어온 종목을 모아 다종목 조회 1회로 보내고,
+결과를 종목별로 나눠 기다리던 호출자들에게 돌려준다.
+묶음 결과에 없는 종목은 None 이므로 호출부가 기존 종목별 소스 순서로 이어서 시도한다.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from core.metrics import QUOTE_BATCH_SIZE
+
+QUOTE_BATCH_WINDOW_MS = float(os.getenv("QUOTE_BATCH_WINDOW_MS", "15"))
+QUOTE_BATCH_MAX = int(os.getenv("QUOTE_BATCH_MAX", "50"))
+QUOTE_BATCH_TIMEOUT = float(os.getenv("QUOTE_BATCH_TIMEOUT", "10"))  # 묶음 결과를 기다리는 최대 시간(초)
+
+
+class _Batch:
+    __slots__ = ("symbols", "full", "done", "results")
+
+    def __init__(self):
+        self.symbols: List[str] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results: Dict[str, Dict] = {}
+
+
+class QuoteBatcher:
+    def __init__(
+        self,
+        fetch_many: Callable[[List[str]], Dict[str, Dict]],
+        window_ms: float = QUOTE_BATCH_WINDOW_MS,
+        max_batch: int = QUOTE_BATCH_MAX,
+    ):
+        self._fetch_many = fetch_many
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._lock = threading.Lock()
+        self._open: Optional[_Batch] = None
+        # 묶음 요청은 요청 컨텍스트(마감 등) 밖의 전용 스레드에서 실행해
+        # 먼저 온 호출자의 짧은 마감 때문에 다른 대기자들의 결과까지 잘리지 않게 한다
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="kobot-quote-batch")
+
+    def _dispatch(self, batch: _Batch):
+        batch.full.wait(self._window)
+        with self._lock:
+            if self._open is batch:
+                self._open = None
+        QUOTE_BATCH_SIZE.observe(len(batch.symbols))
+        try:
+            batch.results = self._fetch_many(batch.symbols) or {}
+        except Exception as exc:
+            print(f"[QuoteBatch] {len(batch.symbols)} symbols 실패: {exc}")
+        finally:
+            batch.done.set()
+
+    def load_many(self, symbols: Iterable[str], timeout: Optional[float] = QUOTE_BATCH_TIMEOUT) -> Dict[str, Optional[Dict]]:
+        """종목들을 열린 묶음에 넣고 결과를 기다린다. 묶음에서 못 받은 종목은 None."""
+        joined: Dict[str, _Batch] = {}
+        with self._lock:
+            for symbol in dict.fromkeys(symbols):
+                batch = self._open
+                if batch is None:
+                    batch = self._open = _Batch()
+                    self._executor.submit(self._dispatch, batch)
+                if symbol not in batch.symbols:
+                    batch.symbols.append(symbol)
+                joined[symbol] = batch
+                if len(batch.symbols) >= self._max_batch:
+                    # 가득 찼으면 창을 기다리지 않고 바로 보내고, 다음 종목은 새 묶음으로
+                    self._open = None
+                    batch.full.set()
+        if timeout is not None:
+            timeout = min(timeout, QUOTE_BATCH_TIMEOUT)
+        for batch in {id(b): b for b in joined.values()}.values():
+            batch.done.wait(timeout)
+        return {
+            symbol: batch.results.get(symbol) if batch.done.is_set() else None
+            for symbol, batch in joined.items()
+        }
+
+    def load(self, symbol: str, timeout: Optional[float] = QUOTE_BATCH_TIMEOUT) -> Optional[Dict]:
+        return self.load_many([symbol], timeout)[symbol]
@@ -0,0 +1,120 @@
+# backend/core/ranking.py
+"""
+국가/ETF 버킷별 점수 랭킹을 증분으로 유지하는 구조.
+
+종목 하나의 점수가 바뀌면 해당 버킷의 정렬 리스트에서 O(log n) 으로 빼고 다시 넣는다.
+상위 k개는 변경이 상위권에 닿았을 때만 다시 만든 tuple 을 캐시해두고,
+읽기 요청에는 그 tuple 을 그대로 돌려준다 (복사/정렬 없음).
+"""
+import heapq
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+# 정렬 키: 점수 내림차순, 동점은 ticker 오름차순
+RankKey = Tuple[float, str]
+
+
+def _rank_key(item: Dict) -> RankKey:
+    return (-float(item.get("score") or 0), item["ticker"])
+
+
+class TopKRanking:
+    def __init__(self, buckets: Iterable[str], k: int):
+        self.k = k
+        self._lock = threading.RLock()
+        self._lists: Dict[str, SortedList] = {b: SortedList() for b in buckets}
+        self._entries: Dict[str, Tuple[str, RankKey]] = {}  # ticker → (bucket, key)
+        self._items: Dict[str, Dict] = {}
+        self._top: Dict[str, Optional[Tuple[Dict, ...]]] = {b: None for b in self._lists}
+        self._combined: Optional[Tuple[Dict, ...]] = None
+
+    def _touches_top(self, bucket: str, key: RankKey) -> bool:
+        return self._lists[bucket].bisect_left(key) < self.k
+
+    def _invalidate(self, bucket: str):
+        self._top[bucket] = None
+        self._combined = None
+
+    def update(self, item: Dict) -> bool:
+        """종목 하나의 최신 값을 반영. 버킷이 없는 항목은 무시하고 False 반환."""
+        ticker = item.get("ticker")
+        bucket = item.get("country")
+        if not ticker or bucket not in self._lists:
+            return False
+        key = _rank_key(item)
+        with self._lock:
+            old = self._entries.get(ticker)
+            dirty = False
+            if old is not None:
+                old_bucket, old_key = old
+                dirty = self._touches_top(old_bucket, old_key)
+                self._lists[old_bucket].remove(old_key)
+                if dirty:
+                    self._invalidate(old_bucket)
+            self._lists[bucket].add(key)
+            self._entries[ticker] = (bucket, key)
+            self._items[ticker] = item
+            if self._touches_top(bucket, key):
+                self._invalidate(bucket)
+        return True
+
+    def remove(self, ticker: str):
+        with self._lock:
+            old = self._entries.pop(ticker, None)
+            self._items.pop(ticker, None)
+            if old is None:
+                return
+            bucket, key = old
+            if self._touches_top(bucket, key):
+                self._invalidate(bucket)
+            self._lists[bucket].remove(key)
+
+    def top(self, bucket: str) -> Tuple[Dict, ...]:
+        """버킷 상위 k개 (캐시된 tuple, 호출자는 수정하지 말 것)."""
+        cached = self._top.get(bucket)
+        if cached is not None:
+            return cached
+        with self._lock:
+            if self._top.get(bucket) is None:
+                keys = self._lists[bucket].islice(0, self.k)
+                self._top[bucket] = tuple(self._items[ticker] for _, ticker in keys)
+            return self._top[bucket]
+
+    def top_all(self) -> Tuple[Dict, ...]:
+        """모든 버킷의 상위 k개를 버킷 순서대로 이어붙인 결과 (캐시)."""
+        cached = self._combined
+        if cached is not None:
+            return cached
+        with self._lock:
+            if self._combined is None:
+                combined: List[Dict] = []
+                for bucket in self._lists:
+                    combined.extend(self.top(bucket))
+                self._combined = tuple(combined)
+            return self._combined
+
+    def rank_of(self, ticker: str) -> Optional[int]:
+        """버킷 내 0부터 시작하는 순위 (O(log n))."""
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is None:
+                return None
+            bucket, key = entry
+            return self._lists[bucket].index(key)
+
+    def top_movers(self, bucket: str, n: int) -> List[Dict]:
+        """등락폭(절대값) 상위 n개."""
+        with self._lock:
+            items = [self._items[ticker] for _, ticker in self._lists[bucket]]
+        return heapq.nlargest(n, items, key=lambda x: abs(x.get("change_pct") or 0))
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        return self._items.get(ticker)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,189 @@
+# backend/core/screener.py
+"""
+유니버스 스크리너용 인메모리 컬럼 테이블.
+
+시세/펀더멘털/점수·지표가 갱신될 때마다 data_handler / kobot_engine 이 update() 로 해당 종목 행의
+컬럼 값만 바꿔두고, 조회는 외부 호출 없이 numpy 벡터 연산으로 필터 → 정렬 → limit 한다.
+자주 쓰는 정렬 필드는 argsort 결과를 버전별로 캐시해 값이 바뀐 뒤 첫 조회에서만 다시 만든다.
+
+필터는 {field}_min / {field}_max (포함) 형식. roe / dividend_yield 는 소수(0.1 = 10%).
+"""
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
+
+from core.lazy_modules import _np
+
+if TYPE_CHECKING:
+    import numpy as np
+
+FIELDS = (
+    "score",
+    "price",
+    "change_pct",
+    "market_cap",
+    "per",
+    "pbr",
+    "psr",
+    "roe",
+    "dividend_yield",
+    "rsi",
+    "volatility",
+    "return_30d",
+)
+# argsort 를 캐시해두는 정렬 필드
+INDEXED_FIELDS = ("score", "change_pct", "market_cap", "per", "roe", "rsi", "dividend_yield")
+COUNTRIES = ("US", "KR", "ETF")
+_INITIAL_CAPACITY = 1024
+
+
+def parse_filters(params: Mapping[str, str]) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    """쿼리 파라미터에서 {field}_min / {field}_max 를 골라 (min, max) 로. 잘못된 값은 ValueError."""
+    filters: Dict[str, List[Optional[float]]] = {}
+    for key, raw in params.items():
+        field, _, bound = key.rpartition("_")
+        if bound not in ("min", "max"):
+            continue
+        if field not in FIELDS:
+            raise ValueError(f"unknown filter field: {field}")
+        try:
+            value = float(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"{key} must be a number")
+        filters.setdefault(field, [None, None])[0 if bound == "min" else 1] = value
+    return {field: (lo, hi) for field, (lo, hi) in filters.items()}
+
+
+class ScreenerTable:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._tickers: List[str] = []
+        self._names: List[Optional[str]] = []
+        self._cols: Dict[str, "np.ndarray"] = {}
+        self._country: Optional["np.ndarray"] = None  # COUNTRIES 인덱스, -1 = 모름
+        self._updated: Optional["np.ndarray"] = None
+        self._versions: Dict[str, int] = {f: 0 for f in FIELDS}
+        self._sorted: Dict[Tuple[str, bool], Tuple[int, int, "np.ndarray"]] = {}
+
+    # ---- 저장 ----------------------------------------------------------
+    def _ensure_capacity(self, size: int):
+        np = _np()
+        capacity = len(self._updated) if self._updated is not None else 0
+        if size <= capacity:
+            return
+        new_capacity = max(_INITIAL_CAPACITY, capacity * 2, size)
+
+        def grow(arr, fill, dtype):
+            out = np.full(new_capacity, fill, dtype=dtype)
+            if arr is not None:
+                out[: len(arr)] = arr
+            return out
+
+        for field in FIELDS:
+            self._cols[field] = grow(self._cols.get(field), np.nan, np.float64)
+        self._country = grow(self._country, -1, np.int8)
+        self._updated = grow(self._updated, 0.0, np.float64)
+
+    def _row(self, ticker: str) -> int:
+        row = self._rows.get(ticker)
+        if row is None:
+            row = len(self._tickers)
+            self._ensure_capacity(row + 1)
+            self._rows[ticker] = row
+            self._tickers.append(ticker)
+            self._names.append(None)
+        return row
+
+    def update(self, ticker: str, name: Optional[str] = None, country: Optional[str] = None, **fields: Any):
+        """종목 행의 주어진 컬럼만 갱신 (None / 알 수 없는 필드는 무시)."""
+        if not ticker:
+            return
+        ticker = ticker.upper()
+        with self._lock:
+            row = self._row(ticker)
+            if name:
+                self._names[row] = name
+            if country in COUNTRIES:
+                self._country[row] = COUNTRIES.index(country)
+            for field, value in fields.items():
+                if field not in self._cols or value is None:
+                    continue
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                col = self._cols[field]
+                if col[row] != value:
+                    col[row] = value
+                    self._versions[field] += 1
+            self._updated[row] = time.time()
+
+    # ---- 조회 ----------------------------------------------------------
+    def _order(self, field: str, descending: bool) -> "np.ndarray":
+        """정렬 인덱스 (NaN 은 항상 뒤). 캐시된 필드는 값이 바뀌었을 때만 다시 계산."""
+        np = _np()
+        n = len(self._tickers)
+        key = (field, descending)
+        cached = self._sorted.get(key)
+        version = self._versions[field]
+        if cached and cached[0] == version and cached[1] == n:
+            return cached[2]
+        col = self._cols[field][:n]
+        order = np.argsort(-col if descending else col, kind="stable")
+        if field in INDEXED_FIELDS:
+            self._sorted[key] = (version, n, order)
+        return order
+
+    def query(
+        self,
+        filters: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        country: Optional[str] = None,
+        sort: str = "score",
+        descending: bool = True,
+        limit: int = 50,
+    ) -> Dict[str, Any]:
+        if sort not in FIELDS:
+            raise ValueError(f"sort must be one of {list(FIELDS)}")
+        if country is not None and country.upper() not in COUNTRIES:
+            raise ValueError(f"country must be one of {list(COUNTRIES)}")
+        for field in filters or {}:
+            if field not in FIELDS:
+                raise ValueError(f"unknown filter field: {field}")
+        with self._lock:
+            n = len(self._tickers)
+            if n == 0:
+                return {"total": 0, "matched": 0, "items": []}
+            np = _np()
+            mask = np.ones(n, dtype=bool)
+            if country is not None:
+                mask &= self._country[:n] == COUNTRIES.index(country.upper())
+            # NaN 비교는 False 이므로 값이 없는 종목은 해당 필터에서 자연히 빠진다
+            for field, (lo, hi) in (filters or {}).items():
+                col = self._cols[field][:n]
+                if lo is not None:
+                    mask &= col >= lo
+                if hi is not None:
+                    mask &= col <= hi
+            order = self._order(sort, descending)
+            selected = order[mask[order]]
+            rows = selected[: max(0, limit)].tolist()
+            values = {field: self._cols[field][rows].tolist() for field in FIELDS}
+            countries = self._country[rows].tolist()
+            updated = self._updated[rows].tolist()
+            items = []
+            for i, row in enumerate(rows):
+                item = {"ticker": self._tickers[row], "name": self._names[row]}
+                item["country"] = COUNTRIES[countries[i]] if countries[i] >= 0 else None
+                for field in FIELDS:
+                    value = values[field][i]
+                    item[field] = None if value != value else value  # NaN → None
+                item["updated_at"] = updated[i]
+                items.append(item)
+            return {"total": n, "matched": int(len(selected)), "items": items}
+
+    def __len__(self) -> int:
+        return len(self._tickers)
+
+
+SCREENER = ScreenerTable()
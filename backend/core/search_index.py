@@ -0,0 +1,177 @@
+# backend/core/search_index.py
+"""
+종목 검색/자동완성용 메모리 인덱스.
+
+심볼, KR 종목코드(005930), 한글/영문 종목명, 별칭을 정규화해
+- prefix 인덱스 (입력 중 자동완성)
+- 2/3-gram 인덱스 (중간 글자 검색, 오타 약간 허용)
+에 넣어두고 외부 호출 없이 조회한다.
+"""
+import json
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+MAX_PREFIX = 16  # 이 길이까지의 prefix 만 인덱싱
+MIN_GRAM_RATIO = 0.5  # n-gram 매칭 시 최소 일치 비율
+
+_STRIP_RE = re.compile(r"[\s\.,\-&()'/]+")
+_PAREN_RE = re.compile(r"\(.*?\)")
+# 종목명 정확 매칭 시 떼어내는 법인 형태 (Apple Inc. → apple)
+_CORP_WORDS = {"the", "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited", "plc", "sa", "nv"}
+
+LISTINGS_FILE = Path(__file__).resolve().parent.parent / "config" / "listings.json"
+
+
+def normalize(text: str) -> str:
+    """대소문자/전각/공백/구두점 차이를 없앤 검색 키."""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return _STRIP_RE.sub("", text)
+
+
+def _name_keys(name: str) -> Set[str]:
+    """종목명의 정확 매칭 키. 전체 이름과 괄호/법인 형태를 뗀 이름."""
+    keys = {normalize(name)}
+    words = [w.strip(".") for w in re.split(r"[\s,]+", _PAREN_RE.sub(" ", name.lower())) if w.strip(".")]
+    while words and words[-1] in _CORP_WORDS:
+        words.pop()
+    keys.add(normalize(" ".join(words)))
+    if words and words[0] == "the":
+        keys.add(normalize(" ".join(words[1:])))
+    keys.discard("")
+    return keys
+
+
+def _grams(term: str, n: int) -> Set[str]:
+    if len(term) < n:
+        return set()
+    return {term[i : i + n] for i in range(len(term) - n + 1)}
+
+
+class TickerSearchIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._exact: Dict[str, str] = {}  # 정규화된 심볼/종목코드 → 심볼
+        self._names: Dict[str, str] = {}  # 정규화된 종목명/별칭 → 심볼 (먼저 등록된 쪽 우선)
+        self._prefix: Dict[str, Set[str]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._terms: Dict[str, Set[str]] = {}  # 심볼 → 인덱싱된 검색어 (중복 방지)
+        self.loaded = False
+
+    # ---- 구축 ----------------------------------------------------------
+    def _index_term(self, symbol: str, term: str):
+        term = normalize(term)
+        if not term or term in self._terms.setdefault(symbol, set()):
+            return
+        self._terms[symbol].add(term)
+        for i in range(1, min(len(term), MAX_PREFIX) + 1):
+            self._prefix.setdefault(term[:i], set()).add(symbol)
+        for n in (2, 3):
+            for gram in _grams(term, n):
+                self._grams.setdefault(gram, set()).add(symbol)
+
+    def add(
+        self,
+        symbol: str,
+        country: Optional[str] = None,
+        name_en: Optional[str] = None,
+        name_ko: Optional[str] = None,
+        aliases: Optional[List[str]] = None,
+    ):
+        symbol = symbol.upper()
+        with self._lock:
+            entry = self._entries.setdefault(
+                symbol, {"symbol": symbol, "country": country, "name_en": None, "name_ko": None}
+            )
+            entry["country"] = entry["country"] or country
+            entry["name_en"] = entry["name_en"] or name_en
+            entry["name_ko"] = entry["name_ko"] or name_ko
+            code = symbol.split(".")[0]
+            self._exact[normalize(symbol)] = symbol
+            self._exact.setdefault(normalize(code), symbol)
+            for name in [name_en, name_ko, *(aliases or [])]:
+                for key in _name_keys(name) if name else ():
+                    self._names.setdefault(key, symbol)
+            for term in [symbol, code, name_en, name_ko, *(aliases or [])]:
+                if term:
+                    self._index_term(symbol, term)
+                    # 여러 단어로 된 이름은 단어별로도 prefix 검색이 되게 한다
+                    for word in str(term).split():
+                        self._index_term(symbol, word)
+
+    def add_name(self, symbol: str, name: str):
+        """_get_ticker_name 등에서 새로 알게 된 종목명을 반영."""
+        if symbol and name:
+            self.add(symbol, name_en=name)
+
+    def load_listings(self, path: Path = LISTINGS_FILE):
+        try:
+            with path.open(encoding="utf-8") as f:
+                rows = json.load(f) or []
+        except Exception as exc:
+            print(f"[Search] {path} 로딩 실패: {exc}")
+            rows = []
+        for row in rows:
+            if row.get("symbol"):
+                self.add(
+                    row["symbol"],
+                    country=row.get("country"),
+                    name_en=row.get("name_en"),
+                    name_ko=row.get("name_ko"),
+                    aliases=row.get("aliases"),
+                )
+        self.loaded = True
+
+    # ---- 조회 ----------------------------------------------------------
+    def resolve(self, query: str) -> Optional[str]:
+        """
+        심볼/종목코드, 없으면 종목명/별칭이 정확히 일치할 때 정식 심볼 반환
+        (예: 005930 → 005930.KS, APPLE → AAPL, 삼성전자 → 005930.KS).
+        """
+        key = normalize(query)
+        with self._lock:
+            return self._exact.get(key) or self._names.get(key)
+
+    def is_known(self, symbol: str) -> bool:
+        with self._lock:
+            return symbol.upper() in self._entries
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        q = normalize(query)
+        if not q:
+            return []
+        # add_name 이 요청 스레드에서 집합을 바꿀 수 있으므로 조회 전체를 잠금 안에서
+        with self._lock:
+            return self._search(q, limit)
+
+    def _search(self, q: str, limit: int) -> List[Dict]:
+        scores: Dict[str, float] = {}
+        exact = self._exact.get(q) or self._names.get(q)
+        if exact:
+            scores[exact] = 100.0
+        for symbol in self._prefix.get(q[:MAX_PREFIX], ()):
+            # 심볼 자체가 prefix 로 시작하면 이름 매칭보다 우선
+            bonus = 10 if symbol.lower().startswith(q) else 0
+            scores[symbol] = max(scores.get(symbol, 0), 70.0 + bonus)
+        n = 3 if len(q) >= 3 else 2
+        q_grams = _grams(q, n)
+        if q_grams:
+            hits: Dict[str, int] = {}
+            for gram in q_grams:
+                for symbol in self._grams.get(gram, ()):
+                    hits[symbol] = hits.get(symbol, 0) + 1
+            for symbol, count in hits.items():
+                ratio = count / len(q_grams)
+                if ratio >= MIN_GRAM_RATIO:
+                    scores[symbol] = max(scores.get(symbol, 0), 50.0 * ratio)
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+        return [{**self._entries[symbol], "match": round(score, 1)} for symbol, score in ranked]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+SEARCH_INDEX = TickerSearchIndex()
@@ -0,0 +1,87 @@
+# backend/core/tracing.py
+"""
+요청 단위 경량 구간 측정.
+
+미들웨어가 start_request() 로 요청별 span 목록을 열면, data_handler / kobot_engine 의
+@traced 함수와 span() 블록이 소요 시간을 그 목록에 쌓는다.
+요청이 끝나면 Server-Timing 헤더와 구조화 로그(JSON 한 줄)로 내보낸다.
+
+contextvars 기반이라 run_in_threadpool 스레드까지 전파되며,
+별도 스레드에서 돌릴 작업은 deadline.submit() 으로 제출해야 컨텍스트(span 목록/마감)가 함께 넘어간다.
+"""
+import contextvars
+import re
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+
+_SPANS: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "kobot_spans", default=None
+)
+
+
+def start_request() -> contextvars.Token:
+    return _SPANS.set([])
+
+
+def finish_request(token: contextvars.Token) -> List[Tuple[str, float]]:
+    spans = _SPANS.get() or []
+    _SPANS.reset(token)
+    return spans
+
+
+@contextmanager
+def span(name: str):
+    """요청이 진행 중일 때만 소요 시간(ms)을 기록. 요청 밖에서는 오버헤드가 거의 없다."""
+    spans = _SPANS.get()
+    if spans is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans.append((name, (time.perf_counter() - start) * 1000))
+
+
+def traced(name: Optional[str] = None):
+    """함수 전체를 span 으로 감싸는 데코레이터 (기본 이름은 함수명)."""
+
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _SPANS.get() is None:
+                return func(*args, **kwargs)
+            with span(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def summarize(spans: List[Tuple[str, float]]) -> Dict[str, Dict[str, float]]:
+    """이름별 합계 시간/호출 수 (첫 등장 순서 유지)."""
+    summary: Dict[str, Dict[str, float]] = {}
+    for name, dur in spans:
+        entry = summary.setdefault(name, {"ms": 0.0, "count": 0})
+        entry["ms"] += dur
+        entry["count"] += 1
+    for entry in summary.values():
+        entry["ms"] = round(entry["ms"], 1)
+    return summary
+
+
+_TOKEN_RE = re.compile(r"[^A-Za-z0-9_.\-]")
+
+
+def server_timing_header(summary: Dict[str, Dict[str, float]], total_ms: float) -> str:
+    parts = [
+        f'{_TOKEN_RE.sub("_", name)};dur={entry["ms"]};desc="x{entry["count"]}"'
+        for name, entry in summary.items()
+    ]
+    parts.append(f"total;dur={round(total_ms, 1)}")
+    return ", ".join(parts)
@@ -0,0 +1,266 @@
+# backend/core/universe.py
+"""
+후보 종목 유니버스 관리자.
+
+picks 요청마다 전체 후보를 다시 계산하지 않고, 종목을 갱신 주기(tier)별로 나눠
+백그라운드에서 조금씩 갱신하면서 국가/ETF 별 랭킹을 계속 유지한다.
+
+- hot  : 현재 상위 종목 + 등락폭이 큰 종목 (자주 갱신)
+- warm : 설정 파일의 기본 후보 + 상위권 바로 아래 종목
+- cold : 나머지 롱테일 (드물게 갱신)
+
+갱신 작업은 SLOT_SECONDS 간격의 슬롯으로 나누고, 슬롯마다 외부 API 예산
+(BUDGET_PER_MIN) 안에서 기한이 지난 종목만 처리한다.
+장이 닫혀 종가까지 반영된 시장의 종목은 다음 개장 때까지 갱신을 미룬다.
+"""
+import heapq
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from core import deadline, market_calendar
+from core.metrics import PICKS_REFRESH
+from core.ranking import TopKRanking
+
+TIER_INTERVALS = {
+    "hot": int(os.getenv("UNIVERSE_HOT_INTERVAL", "120")),
+    "warm": int(os.getenv("UNIVERSE_WARM_INTERVAL", "600")),
+    "cold": int(os.getenv("UNIVERSE_COLD_INTERVAL", "3600")),
+}
+SLOT_SECONDS = int(os.getenv("UNIVERSE_SLOT_SECONDS", "10"))
+# 분당 종목 갱신 수 한도 (종목 1개 = 시세 1회 + 점수 계산 1회)
+BUDGET_PER_MIN = int(os.getenv("UNIVERSE_BUDGET_PER_MIN", "60"))
+HOT_MOVERS_PER_COUNTRY = int(os.getenv("UNIVERSE_HOT_MOVERS", "5"))
+# 종목 하나 갱신에 쓰는 시간 예산(초). 넘기면 남은 외부 호출을 건너뛰고 만료된 캐시 값으로 마무리
+ITEM_BUDGET_SECONDS = float(os.getenv("UNIVERSE_ITEM_BUDGET", "20"))
+RELOAD_SECONDS = 600  # 유니버스 목록 재로딩 주기
+BUCKETS = ("US", "KR", "ETF")  # picks 응답 순서
+
+
+class UniverseManager:
+    def __init__(
+        self,
+        load_candidates: Callable[[], List[str]],
+        load_seed: Callable[[], List[str]],
+        refresh_item: Callable[[str], Dict],
+        top_per_country: int,
+        workers: int = 8,
+        bucket_of: Optional[Callable[[str], str]] = None,
+        prefetch: Optional[Callable[[List[str]], object]] = None,
+    ):
+        self._load_candidates = load_candidates
+        self._prefetch = prefetch
+        self._bucket_of = bucket_of or (lambda t: BUCKETS[0])
+        self._load_seed = load_seed
+        self._refresh_item = refresh_item
+        self._top_per_country = top_per_country
+        self._workers = workers
+        self._lock = threading.RLock()
+        self._slot_lock = threading.Lock()
+        self._tickers: Set[str] = set()
+        self._seed: Set[str] = set()
+        self._tiers: Dict[str, str] = {}
+        self._due: List[Tuple[float, str]] = []  # (다음 갱신 시각, ticker) 힙
+        self._next_due: Dict[str, float] = {}
+        self._ranking = TopKRanking(BUCKETS, top_per_country)
+        self._loaded_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._slot_done = threading.Event()
+
+    # ---- 유니버스 구성 -------------------------------------------------
+    def _reload_if_needed(self):
+        now = time.time()
+        if now - self._loaded_at < RELOAD_SECONDS and self._tickers:
+            return
+        tickers = list(dict.fromkeys(self._load_candidates()))
+        seed = set(self._load_seed())
+        with self._lock:
+            self._loaded_at = now
+            self._seed = seed
+            added = [t for t in tickers if t not in self._tickers]
+            removed = self._tickers - set(tickers)
+            self._tickers = set(tickers)
+            for t in removed:
+                self._tiers.pop(t, None)
+                self._next_due.pop(t, None)
+                self._ranking.remove(t)
+            for t in added:
+                self._tiers[t] = "warm" if t in seed else "cold"
+            # 한 번도 계산되지 않은 종목은 즉시 대상. 첫 슬롯부터 모든 버킷이 채워지도록
+            # 버킷별(기본 후보 먼저)로 번갈아 가며 아주 작은 간격으로 줄 세운다
+            for i, t in enumerate(self._interleave(added, seed)):
+                self._schedule(t, now + i * 1e-6)
+
+    def _interleave(self, tickers: List[str], seed: Set[str]) -> List[str]:
+        queues: Dict[str, List[str]] = {}
+        for t in sorted(tickers, key=lambda t: t not in seed):
+            queues.setdefault(self._bucket_of(t), []).append(t)
+        ordered: List[str] = []
+        for i in range(max((len(q) for q in queues.values()), default=0)):
+            ordered.extend(q[i] for q in queues.values() if i < len(q))
+        return ordered
+
+    def _schedule(self, ticker: str, when: float):
+        self._next_due[ticker] = when
+        heapq.heappush(self._due, (when, ticker))
+
+    def _next_refresh_at(self, ticker: str, now: float) -> float:
+        interval = TIER_INTERVALS[self._tiers.get(ticker, "cold")]
+        # 같은 tier 종목들이 한 슬롯에 몰리지 않도록 종목별 고정 오프셋(±10%)을 준다
+        jitter = (zlib.crc32(ticker.encode()) % 200 - 100) / 1000 * interval
+        resume = market_calendar.deferred_until(ticker, now)
+        if resume:
+            # 장이 닫혀 있는 동안은 값이 바뀌지 않으므로 개장 직후로 미루고, 개장 시점에 몰리지 않게 분산
+            return max(now + interval + jitter, resume + abs(jitter))
+        return now + interval + jitter
+
+    def _reassign_tiers(self):
+        """현재 랭킹 기준으로 hot/warm/cold 재배정."""
+        with self._lock:
+            movers: Set[str] = set()
+            for bucket in BUCKETS:
+                movers.update(i["ticker"] for i in self._ranking.top_movers(bucket, HOT_MOVERS_PER_COUNTRY))
+            k = self._top_per_country
+            now = time.time()
+            for t in self._tickers:
+                rank = self._ranking.rank_of(t)
+                if t in movers or (rank is not None and rank < k):
+                    tier = "hot"
+                elif t in self._seed or (rank is not None and rank < k * 3):
+                    tier = "warm"
+                else:
+                    tier = "cold"
+                promoted = TIER_INTERVALS[tier] < TIER_INTERVALS[self._tiers.get(t, "cold")]
+                self._tiers[t] = tier
+                if promoted:
+                    # 느린 tier 에서 잡힌 기한이 더 늦으면 새 주기 기준으로 당긴다
+                    when = self._next_refresh_at(t, now)
+                    if when < self._next_due.get(t, float("inf")):
+                        self._schedule(t, when)
+
+    # ---- 갱신 ----------------------------------------------------------
+    def _pop_due(self, now: float, budget: int) -> List[str]:
+        picked: List[str] = []
+        with self._lock:
+            while self._due and len(picked) < budget:
+                when, ticker = self._due[0]
+                if when > now:
+                    break
+                heapq.heappop(self._due)
+                # 재스케줄로 남은 오래된 힙 항목은 건너뛴다
+                if self._next_due.get(ticker) != when or ticker not in self._tickers:
+                    continue
+                picked.append(ticker)
+        return picked
+
+    def run_slot(self) -> int:
+        """기한이 지난 종목을 예산 한도 안에서 갱신하고 처리한 개수를 반환."""
+        with self._slot_lock:
+            self._reload_if_needed()
+            budget = max(1, BUDGET_PER_MIN * SLOT_SECONDS // 60)
+            now = time.time()
+            tickers = self._pop_due(now, budget)
+            if not tickers:
+                self._slot_done.set()
+                return 0
+            started = time.perf_counter()
+            if self._prefetch is not None:
+                # 슬롯 종목 시세를 한 번에 받아 캐시를 채워두면 종목별 갱신의 시세 조회는 캐시로 끝난다
+                try:
+                    deadline.run_with_budget(ITEM_BUDGET_SECONDS, self._prefetch, tickers)
+                except Exception as exc:
+                    print(f"[Universe] prefetch error: {exc}")
+            workers = min(self._workers, len(tickers))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(
+                        lambda t: deadline.run_with_budget(ITEM_BUDGET_SECONDS, self._refresh_item, t), tickers
+                    )
+                )
+            done = time.time()
+            with self._lock:
+                for ticker, item in zip(tickers, results):
+                    if item and item.get("ticker"):
+                        self._ranking.update(item)
+                self._reassign_tiers()
+                for ticker in tickers:
+                    if ticker in self._tickers:
+                        self._schedule(ticker, self._next_refresh_at(ticker, done))
+            PICKS_REFRESH.observe(time.perf_counter() - started)
+            self._slot_done.set()
+            return len(tickers)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_slot()
+            except Exception as exc:
+                print(f"[Universe] slot error: {exc}")
+            self._stop.wait(SLOT_SECONDS)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="kobot-universe", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ---- 조회 ----------------------------------------------------------
+    def update_item(self, item: Dict) -> bool:
+        """
+        스케줄러 밖에서 계산된 종목 값(예: 상세 분석)을 랭킹에 바로 반영.
+        유니버스에 없는 종목은 picks 에 섞이지 않도록 무시한다.
+        """
+        ticker = item.get("ticker")
+        with self._lock:
+            if ticker not in self._tickers:
+                return False
+            self._ranking.update(item)
+            # 방금 갱신했으므로 다음 정기 갱신을 뒤로 미룬다
+            self._schedule(ticker, self._next_refresh_at(ticker, time.time()))
+        return True
+
+    def top_picks(self) -> Sequence[Dict]:
+        """국가/ETF 별 상위 종목 (랭킹이 캐시한 tuple 그대로). 갱신 작업은 트리거하지 않는다."""
+        self.start()
+        if not len(self._ranking):
+            left = deadline.remaining()
+            if left is None:
+                # 콜드 스타트: 랭킹이 비어 있으면 슬롯 하나만 동기로 돌려 일부라도 채운다
+                self.run_slot()
+            else:
+                # 요청 마감이 있으면 백그라운드 스레드의 첫 슬롯을 남은 시간만큼만 기다린다
+                self._slot_done.wait(left)
+        return self._ranking.top_all()
+
+    def tickers(self) -> List[str]:
+        """유니버스 종목 목록 (hot → warm → cold 순)."""
+        order = {"hot": 0, "warm": 1, "cold": 2}
+        with self._lock:
+            return sorted(self._tickers, key=lambda t: (order.get(self._tiers.get(t), 3), t))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            tiers: Dict[str, int] = {}
+            for tier in self._tiers.values():
+                tiers[tier] = tiers.get(tier, 0) + 1
+            now = time.time()
+            deferred = sum(
+                1 for t, when in self._next_due.items() if when > now and market_calendar.deferred_until(t, now)
+            )
+            return {
+                "tickers": len(self._tickers),
+                "deferred_until_open": deferred,
+                "ranked": len(self._ranking),
+                "tiers": tiers,
+                "budget_per_min": BUDGET_PER_MIN,
+                "slot_seconds": SLOT_SECONDS,
+            }
@@ -0,0 +1,72 @@
+# backend/core/warmup.py
+"""
+단계별 워밍업 파이프라인.
+
+서버가 뜨자마자(또는 keep-alive 핑이 /warmup 을 호출하면) 백그라운드에서
+무거운 모듈 로딩 → 후보/검색 인덱스 → 시장 스냅샷 → picks 랭킹 → 뉴스 수집 시작 순으로 미리 데워두고,
+각 단계의 진행 상황을 status() 로 보여준다.
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class WarmupPipeline:
+    def __init__(self, stages: List[Tuple[str, Callable[[], object]]]):
+        self._stages = stages
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._progress: Dict[str, Dict] = {name: {"status": "pending"} for name, _ in stages}
+
+    def start(self) -> bool:
+        """실행 중이거나 이미 성공적으로 끝났으면 False. 실패한 적이 있으면 다시 시도한다."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            if self._finished_at and all(p["status"] == "done" for p in self._progress.values()):
+                return False
+            self._started_at = time.time()
+            self._finished_at = None
+            self._progress = {name: {"status": "pending"} for name, _ in self._stages}
+            self._thread = threading.Thread(target=self._run, name="kobot-warmup", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self):
+        for name, stage in self._stages:
+            self._progress[name] = {"status": "running"}
+            started = time.perf_counter()
+            try:
+                stage()
+                status = "done"
+                error = None
+            except Exception as exc:
+                status = "failed"
+                error = str(exc)
+                print(f"[Warmup] {name} 실패: {exc}")
+            entry = {"status": status, "seconds": round(time.perf_counter() - started, 3)}
+            if error:
+                entry["error"] = error
+            self._progress[name] = entry
+        self._finished_at = time.time()
+
+    def status(self) -> Dict:
+        stages = dict(self._progress)
+        done = sum(1 for p in stages.values() if p["status"] in ("done", "failed"))
+        if self._started_at is None:
+            state = "idle"
+        elif self._finished_at is None:
+            state = "running"
+        else:
+            state = "failed" if any(p["status"] == "failed" for p in stages.values()) else "ready"
+        return {
+            "state": state,
+            "progress": f"{done}/{len(stages)}",
+            "stages": stages,
+            "started_at": self._started_at,
+            "elapsed": round((self._finished_at or time.time()) - self._started_at, 3)
+            if self._started_at
+            else None,
+        }
@@ -0,0 +1,232 @@
+# backend/loadtest/load_driver.py
+"""
+대시보드 사용 패턴을 재현하는 부하 발생기.
+
+frontend/js/main_dashboard.js 와 같은 순서로 호출한다:
+  1) 접속 시: /market/snapshot(wake-up) → /picks → 섹션별 상위 2개 /recommendation (동시 5개)
+     + /market/snapshot, /market/headlines
+  2) 이후 폴링: picks 120초, snapshot 60초, headlines 300초 주기
+  3) 일부 사용자는 '더보기'(나머지 추천)나 상세 페이지(/recommendation 단건)를 연다
+
+실행 (backend 디렉터리 기준):
+    python loadtest/load_driver.py --base-url http://127.0.0.1:8000/api/v1 \\
+        --users 50 --duration 120 --ramp-up 20 --time-scale 10
+
+--time-scale 10 이면 폴링 주기를 1/10 로 줄여 짧은 시간에 여러 사이클을 돈다.
+결과로 엔드포인트별 처리량과 p50/p95/p99 지연시간을 출력한다.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+# main_dashboard.js 의 상수와 동일하게 유지
+REQUEST_TIMEOUT_S = 45
+MAX_REC_CONCURRENCY = 5
+INITIAL_ITEMS_PER_SECTION = 2
+MAX_ITEMS_PER_SECTION = 15
+PICKS_REFRESH_S = 120
+SNAPSHOT_REFRESH_S = 60
+HEADLINE_REFRESH_S = 300
+# fetchWithTimeout 처럼 클라이언트 timeout 보다 조금 짧은 서버 시간 예산을 timeout_ms 로 보낸다
+BUDGET_MARGIN_MS = 1500
+MIN_BUDGET_MS = 1000
+
+
+class Recorder:
+    """엔드포인트별 지연시간/에러를 모으는 스레드 안전 기록기."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, label: str, elapsed: float, status: str, ok: bool):
+        with self.lock:
+            self.latencies[label].append(elapsed)
+            self.statuses[label][status] += 1
+            if not ok:
+                self.errors[label] += 1
+
+
+def percentile(sorted_vals: List[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, max(0, int(round(pct / 100 * len(sorted_vals) + 0.5)) - 1))
+    return sorted_vals[idx]
+
+
+class VirtualUser(threading.Thread):
+    def __init__(self, uid: int, args, recorder: Recorder, stop_at: float):
+        super().__init__(daemon=True, name=f"user-{uid}")
+        self.args = args
+        self.recorder = recorder
+        self.stop_at = stop_at
+        self.session = requests.Session()
+        self.rng = random.Random(args.seed + uid)
+        self.rec_pool = ThreadPoolExecutor(max_workers=MAX_REC_CONCURRENCY)
+
+    def _get(self, label: str, path: str, timeout: float = REQUEST_TIMEOUT_S) -> Optional[object]:
+        budget_ms = max(int(timeout * 1000) - BUDGET_MARGIN_MS, MIN_BUDGET_MS)
+        url = f"{self.args.base_url}{path}{'&' if '?' in path else '?'}timeout_ms={budget_ms}"
+        start = time.perf_counter()
+        try:
+            r = self.session.get(url, timeout=timeout)
+            elapsed = time.perf_counter() - start
+            ok = r.status_code == 200
+            body = r.json() if ok else None
+            if isinstance(body, dict) and body.get("error"):
+                ok = False
+            self.recorder.record(label, elapsed, str(r.status_code), ok)
+            return body if ok else None
+        except requests.Timeout:
+            self.recorder.record(label, time.perf_counter() - start, "timeout", False)
+        except Exception:
+            self.recorder.record(label, time.perf_counter() - start, "exception", False)
+        return None
+
+    def _recommendations(self, tickers: List[str]):
+        list(self.rec_pool.map(lambda t: self._get("recommendation", f"/recommendation/{t}"), tickers))
+
+    def _dashboard(self):
+        picks = self._get("picks", "/picks")
+        if not isinstance(picks, list) or not picks:
+            return
+        sections: Dict[str, List[str]] = defaultdict(list)
+        for p in picks:
+            if len(sections[p.get("country")]) < MAX_ITEMS_PER_SECTION:
+                sections[p.get("country")].append(p.get("ticker"))
+        initial = [t for items in sections.values() for t in items[:INITIAL_ITEMS_PER_SECTION]]
+        self._recommendations(initial)
+        # '더보기' 클릭
+        if self.rng.random() < self.args.more_ratio:
+            key = self.rng.choice(list(sections))
+            self._recommendations(sections[key][INITIAL_ITEMS_PER_SECTION:])
+        # 상세 페이지 진입
+        if self.rng.random() < self.args.detail_ratio:
+            self._get("recommendation", f"/recommendation/{self.rng.choice([p['ticker'] for p in picks])}")
+
+    def run(self):
+        scale = self.args.time_scale
+        self._get("snapshot", "/market/snapshot", timeout=4)  # wakeUpServer
+        now = time.monotonic()
+        due = {"dashboard": now, "snapshot": now, "headlines": now}
+        periods = {
+            "dashboard": PICKS_REFRESH_S / scale,
+            "snapshot": SNAPSHOT_REFRESH_S / scale,
+            "headlines": HEADLINE_REFRESH_S / scale,
+        }
+        while time.time() < self.stop_at:
+            task = min(due, key=due.get)
+            wait = due[task] - time.monotonic()
+            if wait > 0:
+                time.sleep(min(wait, max(0.0, self.stop_at - time.time())))
+                if time.time() >= self.stop_at:
+                    break
+            if task == "dashboard":
+                self._dashboard()
+            elif task == "snapshot":
+                self._get("snapshot", "/market/snapshot")
+            else:
+                lang = "ko" if self.rng.random() < 0.7 else "en"
+                self._get("headlines", f"/market/headlines?lang={lang}")
+            due[task] = time.monotonic() + periods[task]
+        self.rec_pool.shutdown(wait=True)
+
+
+def report(recorder: Recorder, wall: float) -> Dict[str, Dict]:
+    summary: Dict[str, Dict] = {}
+    all_lat: List[float] = []
+    total_err = 0
+    for label in sorted(recorder.latencies):
+        lat = sorted(recorder.latencies[label])
+        all_lat.extend(lat)
+        total_err += recorder.errors[label]
+        summary[label] = {
+            "count": len(lat),
+            "errors": recorder.errors[label],
+            "rps": round(len(lat) / wall, 2),
+            "p50_ms": round(percentile(lat, 50) * 1000, 1),
+            "p95_ms": round(percentile(lat, 95) * 1000, 1),
+            "p99_ms": round(percentile(lat, 99) * 1000, 1),
+            "max_ms": round(lat[-1] * 1000, 1) if lat else 0,
+            "statuses": dict(recorder.statuses[label]),
+        }
+    all_lat.sort()
+    summary["ALL"] = {
+        "count": len(all_lat),
+        "errors": total_err,
+        "rps": round(len(all_lat) / wall, 2),
+        "p50_ms": round(percentile(all_lat, 50) * 1000, 1),
+        "p95_ms": round(percentile(all_lat, 95) * 1000, 1),
+        "p99_ms": round(percentile(all_lat, 99) * 1000, 1),
+        "max_ms": round(all_lat[-1] * 1000, 1) if all_lat else 0,
+    }
+    return summary
+
+
+def print_table(summary: Dict[str, Dict], wall: float):
+    print(f"\n=== KobotPick load test ({wall:.1f}s) ===")
+    header = f"{'endpoint':<16}{'count':>8}{'err':>6}{'rps':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+    print(header)
+    print("-" * len(header))
+    for label, s in summary.items():
+        print(
+            f"{label:<16}{s['count']:>8}{s['errors']:>6}{s['rps']:>8}"
+            f"{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}"
+        )
+    print("(latency 단위: ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KobotPick dashboard load driver")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000/api/v1")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=60, help="초 단위 전체 실행 시간")
+    parser.add_argument("--ramp-up", type=float, default=10, help="사용자 투입을 분산할 시간(초)")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="폴링 주기 압축 배율")
+    parser.add_argument("--more-ratio", type=float, default=0.3, help="'더보기'를 누르는 비율")
+    parser.add_argument("--detail-ratio", type=float, default=0.3, help="상세 페이지를 여는 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mock-url", default=None, help="mock_upstream 주소 (지정 시 호출 통계 출력)")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+    args.base_url = args.base_url.rstrip("/")
+
+    recorder = Recorder()
+    started = time.time()
+    stop_at = started + args.duration
+    users = []
+    for uid in range(args.users):
+        user = VirtualUser(uid, args, recorder, stop_at)
+        users.append(user)
+        user.start()
+        if args.users > 1 and args.ramp_up > 0:
+            time.sleep(args.ramp_up / args.users)
+    for user in users:
+        user.join()
+    wall = time.time() - started
+
+    summary = report(recorder, wall)
+    print_table(summary, wall)
+    if args.mock_url:
+        try:
+            upstream = requests.get(f"{args.mock_url.rstrip('/')}/_stats", timeout=5).json()
+            summary["_upstream"] = upstream
+            print("\nupstream calls:", json.dumps(upstream.get("counts", {}), indent=2, sort_keys=True))
+        except Exception as exc:
+            print(f"[mock stats error] {exc}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
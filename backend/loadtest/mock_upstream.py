@@ -0,0 +1,302 @@
+# backend/loadtest/mock_upstream.py
+"""
+부하 테스트용 가짜 시세/뉴스 서버.
+
+Finnhub(quote, company-news, news), Alpha Vantage GLOBAL_QUOTE,
+Yahoo search / v7 quote(다종목), Google News RSS 응답 형식을 흉내내며
+지연시간/에러율/호출 제한을 옵션으로 조절할 수 있다.
+
+실행 (backend 디렉터리 기준):
+    python loadtest/mock_upstream.py --port 9100 --latency-ms 150 --jitter-ms 100 \\
+        --error-rate 0.02 --finnhub-rps 30 --alpha-rps 5
+
+백엔드는 아래 환경변수로 이 서버를 바라보게 한다:
+    FINNHUB_KEY=mock ALPHA_VANTAGE_KEY=mock YFINANCE_ENABLED=0 \\
+    FINNHUB_BASE_URL=http://127.0.0.1:9100/finnhub \\
+    ALPHA_VANTAGE_URL=http://127.0.0.1:9100/alpha/query \\
+    YAHOO_SEARCH_URL=http://127.0.0.1:9100/yahoo/v1/finance/search \\
+    YAHOO_QUOTE_URL=http://127.0.0.1:9100/yahoo/v7/finance/quote QUOTE_BATCH_SOURCE=yahoo \\
+    GOOGLE_NEWS_RSS_URL=http://127.0.0.1:9100/gnews/rss \\
+    uvicorn main:app --port 8000
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from typing import Dict, Optional
+from xml.sax.saxutils import escape
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+app = FastAPI()
+
+# 런타임 설정 (CLI 인자 또는 /_config 로 변경)
+CONFIG: Dict[str, float] = {
+    "latency_ms": 120.0,
+    "jitter_ms": 80.0,
+    "error_rate": 0.0,
+    "finnhub_rps": 30.0,  # Finnhub 무료 플랜은 30 req/s, 60 req/min
+    "alpha_rps": 5.0,  # Alpha Vantage 무료 플랜은 분당 5회 수준
+    "yahoo_rps": 0.0,  # 0이면 무제한
+    "gnews_rps": 0.0,
+}
+
+STATS: Counter = Counter()
+_STATS_LOCK = threading.Lock()
+
+
+class TokenBucket:
+    """초당 rate 개의 토큰이 차는 단순 토큰 버킷 (burst = rate)."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+BUCKETS: Dict[str, TokenBucket] = {}
+
+
+def _reset_buckets():
+    for provider in ["finnhub", "alpha", "yahoo", "gnews"]:
+        BUCKETS[provider] = TokenBucket(CONFIG[f"{provider}_rps"])
+
+
+_reset_buckets()
+
+
+def _count(key: str):
+    with _STATS_LOCK:
+        STATS[key] += 1
+
+
+async def _simulate(provider: str) -> Optional[str]:
+    """지연을 흉내내고, 제한/에러 여부를 반환 ("throttled" | "error" | None)."""
+    _count(f"{provider}.requests")
+    delay = CONFIG["latency_ms"] + random.uniform(0, CONFIG["jitter_ms"])
+    await asyncio.sleep(max(0.0, delay) / 1000)
+    if not BUCKETS[provider].allow():
+        _count(f"{provider}.throttled")
+        return "throttled"
+    if random.random() < CONFIG["error_rate"]:
+        _count(f"{provider}.errors")
+        return "error"
+    return None
+
+
+def _base_price(symbol: str) -> float:
+    """심볼마다 고정된 기준가 (KR 종목은 원화 단위)."""
+    h = int(hashlib.md5(symbol.encode()).hexdigest()[:8], 16)
+    base = 20 + h % 480
+    return float(base * 150 if symbol.endswith(".KS") or symbol.startswith("^KS") else base)
+
+
+def _quote(symbol: str) -> Dict[str, float]:
+    prev = _base_price(symbol)
+    # 분 단위로 천천히 움직이는 가격 (캐시 동작 확인용)
+    drift = ((int(time.time() // 60) * 7919 + len(symbol)) % 200 - 100) / 5000
+    price = round(prev * (1 + drift), 2)
+    return {"c": price, "pc": prev, "d": round(price - prev, 2), "dp": round(drift * 100, 4)}
+
+
+def _news_items(symbol: str, n: int):
+    # 5분 단위로만 바뀌게 해서 ETag 재검증(304) 동작을 확인할 수 있게 한다
+    now = int(time.time()) // 300 * 300
+    return [
+        {
+            "title": f"{symbol} mock headline #{i}",
+            "link": f"https://example.com/news/{symbol}/{i}",
+            "publisher": "MockWire",
+            "ts": now - i * 3600,
+        }
+        for i in range(n)
+    ]
+
+
+def _rss(symbol: str, n: int = 10) -> str:
+    items = "".join(
+        "<item>"
+        f"<title>{escape(it['title'])}</title>"
+        f"<link>{escape(it['link'])}</link>"
+        f"<pubDate>{formatdate(it['ts'], usegmt=True)}</pubDate>"
+        f"<source>{it['publisher']}</source>"
+        "</item>"
+        for it in _news_items(symbol, n)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f"<rss version=\"2.0\"><channel><title>Mock News</title>{items}</channel></rss>"
+    )
+
+
+@app.get("/finnhub/quote")
+async def finnhub_quote(symbol: str, token: str = ""):
+    status = await _simulate("finnhub")
+    if status == "throttled":
+        return JSONResponse({"error": "API limit reached. Please try again later."}, status_code=429)
+    if status == "error":
+        return JSONResponse({"error": "internal"}, status_code=502)
+    q = _quote(symbol)
+    return {**q, "h": q["c"], "l": q["pc"], "o": q["pc"], "t": int(time.time())}
+
+
+@app.get("/finnhub/company-news")
+async def finnhub_company_news(symbol: str, token: str = ""):
+    status = await _simulate("finnhub")
+    if status == "throttled":
+        return JSONResponse({"error": "API limit reached. Please try again later."}, status_code=429)
+    if status == "error":
+        return JSONResponse({"error": "internal"}, status_code=502)
+    return [
+        {"headline": it["title"], "url": it["link"], "source": it["publisher"], "datetime": it["ts"]}
+        for it in _news_items(symbol, 10)
+    ]
+
+
+@app.get("/finnhub/news")
+async def finnhub_news(category: str = "general", token: str = ""):
+    return await finnhub_company_news("MARKET", token)
+
+
+@app.get("/alpha/query")
+async def alpha_query(function: str, symbol: str = "", apikey: str = ""):
+    status = await _simulate("alpha")
+    if status == "throttled":
+        # Alpha Vantage는 제한 시에도 200 + Note 필드로 응답한다
+        return {
+            "Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute."
+        }
+    if status == "error":
+        return JSONResponse({"Error Message": "internal"}, status_code=500)
+    if function != "GLOBAL_QUOTE":
+        return {"Error Message": f"Unsupported function {function}"}
+    q = _quote(symbol)
+    return {
+        "Global Quote": {
+            "01. symbol": symbol,
+            "05. price": f"{q['c']:.4f}",
+            "08. previous close": f"{q['pc']:.4f}",
+            "09. change": f"{q['d']:.4f}",
+            "10. change percent": f"{q['dp']:.4f}%",
+        }
+    }
+
+
+@app.get("/yahoo/v1/finance/search")
+async def yahoo_search(q: str, quotesCount: int = 0, newsCount: int = 8):
+    status = await _simulate("yahoo")
+    if status == "throttled":
+        return Response("Too Many Requests", status_code=429)
+    if status == "error":
+        return JSONResponse({"finance": {"error": "internal"}}, status_code=500)
+    return {
+        "quotes": [],
+        "news": [
+            {
+                "title": it["title"],
+                "link": it["link"],
+                "publisher": it["publisher"],
+                "providerPublishTime": it["ts"],
+            }
+            for it in _news_items(q, newsCount)
+        ],
+    }
+
+
+@app.get("/yahoo/v7/finance/quote")
+async def yahoo_quote(symbols: str):
+    status = await _simulate("yahoo")
+    if status == "throttled":
+        return Response("Too Many Requests", status_code=429)
+    if status == "error":
+        return JSONResponse({"quoteResponse": {"result": [], "error": "internal"}}, status_code=500)
+    _count("yahoo.quote_requests")
+    result = []
+    for symbol in filter(None, symbols.split(",")):
+        with _STATS_LOCK:
+            STATS["yahoo.quote_symbols"] += 1
+        q = _quote(symbol)
+        result.append(
+            {
+                "symbol": symbol,
+                "regularMarketPrice": q["c"],
+                "regularMarketPreviousClose": q["pc"],
+                "regularMarketChangePercent": q["dp"],
+                "currency": "KRW" if symbol.endswith(".KS") else "USD",
+                "shortName": f"{symbol} Mock Corp",
+            }
+        )
+    return {"quoteResponse": {"result": result, "error": None}}
+
+
+@app.get("/gnews/rss")
+@app.get("/gnews/rss/search")
+async def google_news_rss(
+    request: Request, q: str = "TOP", hl: str = "en", gl: str = "US", ceid: str = ""
+):
+    status = await _simulate("gnews")
+    if status == "throttled":
+        return Response("Too Many Requests", status_code=429)
+    if status == "error":
+        return Response("Service Unavailable", status_code=503)
+    body = _rss(q)
+    etag = '"' + hashlib.md5(body.encode()).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        _count("gnews.not_modified")
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/rss+xml", headers={"ETag": etag})
+
+
+@app.get("/_stats")
+async def stats():
+    with _STATS_LOCK:
+        return {"config": CONFIG, "counts": dict(STATS)}
+
+
+@app.post("/_config")
+async def update_config(request: Request):
+    """실행 중 지연/에러율/제한값 변경 (예: {"error_rate": 0.2})."""
+    body = await request.json()
+    for key, value in (body or {}).items():
+        if key in CONFIG:
+            CONFIG[key] = float(value)
+    _reset_buckets()
+    return CONFIG
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KobotPick mock upstream server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    for key, value in CONFIG.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=float, default=value)
+    args = parser.parse_args()
+    for key in CONFIG:
+        CONFIG[key] = getattr(args, key)
+    _reset_buckets()
+
+    import uvicorn
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# backend/loadtest/startup_bench.py
+"""
+콜드 스타트 예산 측정.
+
+1) `import main` 소요 시간 (새 인터프리터에서 N회, 중앙값)과
+   그 시점에 무거운 모듈(yfinance/pandas/numpy/requests)이 로딩되지 않았는지 확인
+2) uvicorn 프로세스 실행 → 첫 응답(GET /)까지 걸린 시간 (time-to-first-response)
+3) (선택) /warmup 이 ready 가 될 때까지 걸린 시간
+
+예산을 넘으면 종료 코드 1 로 끝나므로 CI 에서 회귀 감지용으로 쓸 수 있다.
+
+실행 (backend 디렉터리 기준, 외부 호출 없이 재려면 mock_upstream 환경변수와 함께):
+    python loadtest/startup_bench.py --runs 5 --import-budget-ms 800 --ttfr-budget-ms 3000
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("yfinance", "pandas", "numpy", "requests")
+
+_IMPORT_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import main
+elapsed = (time.perf_counter() - t) * 1000
+print(json.dumps({"ms": elapsed, "heavy": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_import(runs: int):
+    samples, heavy = [], set()
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        data = json.loads(out.stdout.strip().splitlines()[-1])
+        samples.append(data["ms"])
+        heavy.update(data["heavy"])
+    return statistics.median(samples), sorted(heavy)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(timeout: float, wait_warmup: bool):
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=os.environ.copy(),
+    )
+    ttfr = warmup_s = None
+    try:
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            try:
+                if requests.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                    ttfr = time.perf_counter() - started
+                    break
+            except requests.RequestException:
+                time.sleep(0.02)
+        if ttfr is not None and wait_warmup:
+            while time.perf_counter() < deadline:
+                status = requests.get(f"http://127.0.0.1:{port}/warmup", timeout=5).json()
+                if status["warmup"]["state"] in ("ready", "failed"):
+                    warmup_s = time.perf_counter() - started
+                    break
+                time.sleep(0.2)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return ttfr, warmup_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KobotPick startup budget benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=800)
+    parser.add_argument("--ttfr-budget-ms", type=float, default=3000)
+    parser.add_argument("--warmup-budget-s", type=float, default=None, help="지정 시 /warmup ready 까지 측정")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    import_ms, heavy = measure_import(args.runs)
+    ttfr, warmup_s = measure_first_response(args.timeout, args.warmup_budget_s is not None)
+
+    failures = []
+    print(f"import main (median of {args.runs}): {import_ms:.0f} ms  [budget {args.import_budget_ms:.0f} ms]")
+    if import_ms > args.import_budget_ms:
+        failures.append("import time")
+    if heavy:
+        print(f"  eager heavy imports: {', '.join(heavy)}")
+        failures.append("eager heavy imports")
+    if ttfr is None:
+        print("time to first response: server did not answer")
+        failures.append("first response")
+    else:
+        print(f"time to first response: {ttfr * 1000:.0f} ms  [budget {args.ttfr_budget_ms:.0f} ms]")
+        if ttfr * 1000 > args.ttfr_budget_ms:
+            failures.append("first response")
+    if args.warmup_budget_s is not None:
+        if warmup_s is None:
+            print("warmup: not finished before timeout")
+            failures.append("warmup")
+        else:
+            print(f"warmup ready: {warmup_s:.1f} s  [budget {args.warmup_budget_s:.1f} s]")
+            if warmup_s > args.warmup_budget_s:
+                failures.append("warmup")
+
+    if failures:
+        print(f"FAIL: {', '.join(failures)}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,173 @@
-from fastapi import FastAPI
+import asyncio
+import json
+import time
+
+from typing import List, Optional
+
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.concurrency import run_in_threadpool
+import anyio
 import datetime
+import os
 
-from core.kobot_engine import get_top_stocks, analyze_and_recommend
-from core.data_handler import get_market_snapshot, get_global_headlines
+from core.kobot_engine import (
+    WARMUP,
+    get_top_stocks,
+    analyze_and_recommend,
+    register_target_alerts,
+    resolve_ticker,
+    screen_universe,
+    search_tickers,
+)
+from core.data_handler import get_candles, get_market_snapshot, get_global_headlines
+from core import deadline, market_calendar
+from core.alerts import ALERTS
+from core.history import HISTORY
+from core.metrics import observe_http, render_latest
+from core.profiler import PROFILER
+from core.tracing import finish_request, server_timing_header, start_request, summarize
+from models.stock_model import AlertCreate, AlertTargetsCreate, CandleSeries, ScoreHistory, ScreenerResult, TickerSearchResult
 
 app = FastAPI()
 
+# run_in_threadpool 이 사용하는 스레드 수 (0이면 anyio 기본값 40 유지). 부하 테스트로 튜닝.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "0"))
+# 이 시간(ms) 이상 걸린 API 요청만 구간별 타이밍 로그를 남긴다 (0이면 전부)
+TIMING_LOG_MS = float(os.getenv("TIMING_LOG_MS", "0"))
+# /admin/* 접근 토큰. 비어 있으면 관리자 기능 비활성화
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+# 알림 SSE 스트림의 수신함 확인 주기 / keep-alive 주석 전송 주기 (초)
+ALERT_STREAM_POLL_SECONDS = float(os.getenv("ALERT_STREAM_POLL_SECONDS", "1"))
+ALERT_STREAM_KEEPALIVE_SECONDS = 15
+# API 요청 시간 예산(ms). 클라이언트가 X-Request-Timeout-Ms 헤더나 timeout_ms 쿼리로 더 짧게/길게 줄 수 있다 (상한 있음)
+REQUEST_DEADLINE_MS = float(os.getenv("REQUEST_DEADLINE_MS", "10000"))
+REQUEST_DEADLINE_MAX_MS = float(os.getenv("REQUEST_DEADLINE_MAX_MS", "60000"))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 대시보드(다른 origin)에서 부분 결과 여부 / 서버 구간 시간을 읽을 수 있도록
+    expose_headers=["X-Data-Stale", "Server-Timing"],
 )
 
+def _request_budget_s(request: Request):
+    """요청 헤더/쿼리의 시간 예산(ms)을 서버 상한 안으로 맞춰 초 단위로 반환. API 가 아니면 None."""
+    if not request.url.path.startswith("/api/"):
+        return None
+    raw = request.headers.get("x-request-timeout-ms") or request.query_params.get("timeout_ms")
+    try:
+        budget_ms = float(raw) if raw else REQUEST_DEADLINE_MS
+    except ValueError:
+        budget_ms = REQUEST_DEADLINE_MS
+    if budget_ms <= 0:
+        return None
+    return min(budget_ms, REQUEST_DEADLINE_MAX_MS) / 1000
+
+@app.middleware("http")
+async def record_request_timing(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    trace_token = start_request()
+    deadline_tokens = deadline.start_request(_request_budget_s(request))
+    profiling = PROFILER.begin_request() if request.url.path.startswith("/api/") else False
+    response = None
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        if profiling:
+            PROFILER.end_request()
+        spans = finish_request(trace_token)
+        stale = deadline.finish_request(deadline_tokens)
+        if stale and response is not None:
+            # 마감 때문에 만료된 캐시로 채운 데이터 종류 (price, score, news 등)
+            response.headers["X-Data-Stale"] = ",".join(stale)
+        total_ms = (time.perf_counter() - start) * 1000
+        # 경로 파라미터가 라벨 폭증을 만들지 않도록 라우트 템플릿으로 집계
+        route = request.scope.get("route")
+        path = getattr(route, "path", None) or "unmatched"
+        observe_http(request.method, path, status, total_ms / 1000)
+        if spans:
+            summary = summarize(spans)
+            if response is not None:
+                response.headers["Server-Timing"] = server_timing_header(summary, total_ms)
+            if total_ms >= TIMING_LOG_MS:
+                print(
+                    json.dumps(
+                        {
+                            "event": "request_timing",
+                            "method": request.method,
+                            "path": request.url.path,
+                            "route": path,
+                            "status": status,
+                            "total_ms": round(total_ms, 1),
+                            "spans": summary,
+                        },
+                        ensure_ascii=False,
+                    )
+                )
+
+def require_admin(token: str = None):
+    if not ADMIN_TOKEN or token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="admin token required")
+
+@app.on_event("startup")
+async def configure_threadpool():
+    if THREADPOOL_SIZE > 0:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+@app.on_event("startup")
+async def start_warmup():
+    # 모듈 로딩 → 후보 → 점수 이력 → 스냅샷 → picks 랭킹(유니버스 스케줄러) → 뉴스 수집 순으로 백그라운드 워밍업
+    WARMUP.start()
+
 @app.get("/")
 def root():
     return {"message": "Kobot Pick API Running", "time": datetime.datetime.utcnow().isoformat()}
 
 @app.get("/warmup")
-def warmup():
-    return {"status": "awake", "time": datetime.datetime.utcnow().isoformat()}
+async def warmup():
+    # 응답은 바로 돌려주고, 워밍업이 안 돌았거나 실패했으면 백그라운드로 다시 시작
+    WARMUP.start()
+    return {
+        "status": "awake",
+        "time": datetime.datetime.utcnow().isoformat(),
+        "warmup": WARMUP.status(),
+        # 이력 잠금은 기록 중인 스레드와 공유하므로 이벤트 루프 밖에서 집계
+        "history": await run_in_threadpool(HISTORY.stats),
+    }
+
+@app.get("/metrics")
+async def metrics():
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+@app.post("/admin/profile")
+async def arm_profiler(requests: int = 20, interval_ms: float = 5.0, x_admin_token: str = Header(None)):
+    """다음 N개 API 요청 동안 샘플링 프로파일러를 켠다."""
+    require_admin(x_admin_token)
+    return PROFILER.arm(requests, interval_ms)
+
+@app.get("/admin/profile/status")
+async def profiler_status(x_admin_token: str = Header(None)):
+    require_admin(x_admin_token)
+    return PROFILER.status()
+
+@app.get("/admin/profile")
+async def download_profile(x_admin_token: str = Header(None)):
+    """collapsed stack 형식 (speedscope / flamegraph.pl 호환)."""
+    require_admin(x_admin_token)
+    return Response(
+        content=PROFILER.dump(),
+        media_type="text/plain",
+        headers={"Content-Disposition": 'attachment; filename="kobot-profile.folded"'},
+    )
 
 @app.get("/api/v1/picks")
 async def picks():
@@ -30,13 +175,129 @@ async def picks():
 
 @app.get("/api/v1/recommendation/{ticker}")
 async def recommendation(ticker: str):
-    result = await run_in_threadpool(analyze_and_recommend, ticker.upper())
+    # 모르는 종목은 외부 호출 없이 바로 거절하고 비슷한 종목을 제안
+    symbol = await run_in_threadpool(resolve_ticker, ticker)
+    if symbol is None:
+        return {"error": "Unknown ticker", "suggestions": await run_in_threadpool(search_tickers, ticker, 5)}
+    result = await run_in_threadpool(analyze_and_recommend, symbol)
     return result or {"error": "No data"}
 
+@app.get("/api/v1/candles/{ticker}", response_model=CandleSeries)
+async def candles(
+    ticker: str,
+    range: str = "1y",
+    interval: str = "1d",
+    points: int = Query(None, ge=10, le=5000),
+):
+    symbol = await run_in_threadpool(resolve_ticker, ticker)
+    if symbol is None:
+        raise HTTPException(status_code=404, detail="Unknown ticker")
+    try:
+        return await run_in_threadpool(get_candles, symbol, range, interval, points)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@app.get("/api/v1/history/scores/{ticker}", response_model=ScoreHistory)
+async def score_history(
+    ticker: str,
+    start: int = Query(None, ge=0),
+    end: int = Query(None, ge=0),
+    limit: int = Query(None, ge=1, le=10000),
+):
+    """start / end: epoch 초 (포함). 메모리 조회만."""
+    symbol = await run_in_threadpool(resolve_ticker, ticker)
+    if symbol is None:
+        raise HTTPException(status_code=404, detail="Unknown ticker")
+    try:
+        # 첫 조회는 디스크 이력 로딩(파일 읽기/numpy import)을 할 수 있으므로 이벤트 루프 밖에서
+        return await run_in_threadpool(HISTORY.query, symbol, start, end, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@app.get("/api/v1/search", response_model=List[TickerSearchResult])
+async def search(q: str = Query(..., min_length=1, max_length=64), limit: int = Query(10, ge=1, le=50)):
+    # 첫 호출은 검색 인덱스 구축(listings.json 로딩)을 하므로 이벤트 루프 밖에서
+    return await run_in_threadpool(search_tickers, q, limit)
+
+@app.get("/api/v1/screener", response_model=ScreenerResult)
+async def screener(
+    request: Request,
+    country: Optional[str] = None,
+    sort: str = "score",
+    order: str = "desc",
+    limit: int = Query(50, ge=1, le=500),
+):
+    """예: /api/v1/screener?country=KR&per_max=15&roe_min=0.1&rsi_max=40 (메모리 조회만)"""
+    try:
+        # 스크리너 잠금을 시세 갱신 스레드와 공유하고 결과 dict 구성도 종목 수에 비례하므로 이벤트 루프 밖에서
+        return await run_in_threadpool(screen_universe, dict(request.query_params), country, sort, order, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@app.post("/api/v1/alerts")
+async def create_alert(body: AlertCreate):
+    symbol = await run_in_threadpool(resolve_ticker, body.ticker)
+    if symbol is None:
+        raise HTTPException(status_code=404, detail="Unknown ticker")
+    try:
+        # webhook 호스트 확인(DNS 조회)이 막힐 수 있으므로 이벤트 루프 밖에서
+        return await run_in_threadpool(
+            ALERTS.add, symbol, body.condition, body.price, body.client_id, body.webhook_url, body.note
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@app.post("/api/v1/alerts/targets/{ticker}")
+async def create_target_alerts(ticker: str, body: AlertTargetsCreate):
+    symbol = await run_in_threadpool(resolve_ticker, ticker)
+    if symbol is None:
+        raise HTTPException(status_code=404, detail="Unknown ticker")
+    try:
+        return await run_in_threadpool(register_target_alerts, symbol, body.client_id, body.webhook_url)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@app.get("/api/v1/alerts")
+async def list_alerts(client_id: str):
+    return ALERTS.for_client(client_id)
+
+@app.delete("/api/v1/alerts/{alert_id}")
+async def delete_alert(alert_id: int, client_id: str):
+    if not ALERTS.remove(alert_id, client_id):
+        raise HTTPException(status_code=404, detail="Alert not found")
+    return {"deleted": alert_id}
+
+@app.get("/api/v1/alerts/stream")
+async def alert_stream(request: Request, client_id: str, last_event_id: str = Header(None)):
+    """발송된 알림을 Server-Sent Events 로 push (재연결 시 Last-Event-ID 이후부터)."""
+    cursor = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+
+    async def events():
+        nonlocal cursor
+        idle = 0.0
+        while not await request.is_disconnected():
+            items = ALERTS.events_since(client_id, cursor)
+            for event in items:
+                cursor = event["seq"]
+                payload = json.dumps({k: v for k, v in event.items() if k != "webhook_url"}, ensure_ascii=False)
+                yield f"id: {cursor}\nevent: alert\ndata: {payload}\n\n"
+            idle = 0.0 if items else idle + ALERT_STREAM_POLL_SECONDS
+            if idle >= ALERT_STREAM_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(ALERT_STREAM_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.get("/api/v1/market/snapshot")
 async def snapshot():
     return await run_in_threadpool(get_market_snapshot)
 
+@app.get("/api/v1/market/status")
+async def market_status():
+    # 정규장 개장 여부 / 직전 마감 / 다음 개장 (UTC)
+    return market_calendar.status()
+
 @app.get("/api/v1/market/headlines")
 async def headlines(lang: str = "en"):
     return await run_in_threadpool(get_global_headlines, lang)
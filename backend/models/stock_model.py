@@ -21,6 +21,31 @@ class HistoricalCandle(BaseModel):
     close: float
 
 
+class CandleSeries(BaseModel):
+    """컬럼 형식 캔들 (t: epoch 초, 거래소 현지 시각 기준)."""
+    ticker: str
+    range: str
+    interval: str
+    points: int
+    source_points: int
+    t: List[int]
+    o: List[float]
+    h: List[float]
+    l: List[float]
+    c: List[float]
+    v: List[float]
+
+
+class ScoreHistory(BaseModel):
+    """컬럼 형식 점수 이력 (t: epoch 초, 오래된 순)."""
+    ticker: str
+    points: int
+    t: List[int]
+    score: List[int]
+    action: List[Optional[str]]
+    price: List[Optional[float]]
+
+
 class NewsItem(BaseModel):
     title: str
     link: str
@@ -56,6 +81,9 @@ class StockRecommendation(BaseModel):
     historical: List[HistoricalCandle]
     news: List[NewsItem]
     profile: CompanyProfile
+    # 요청 마감 때문에 만료된 캐시로 채운 항목 / 마감까지 끝나지 않은 항목
+    stale: List[str] = []
+    pending: List[str] = []
     # 향후 market_cap, per 등 펀더멘탈 정보 추가 가능
 
 class PickItem(BaseModel):
@@ -67,3 +95,52 @@ class PickItem(BaseModel):
 
 class KobotPicks(BaseModel):
     picks: List[PickItem]
+
+
+class TickerSearchResult(BaseModel):
+    symbol: str
+    country: Optional[str] = None
+    name_en: Optional[str] = None
+    name_ko: Optional[str] = None
+    match: float
+
+
+class ScreenerItem(BaseModel):
+    ticker: str
+    name: Optional[str] = None
+    country: Optional[str] = None
+    score: Optional[float] = None
+    price: Optional[float] = None
+    change_pct: Optional[float] = None
+    market_cap: Optional[float] = None
+    per: Optional[float] = None
+    pbr: Optional[float] = None
+    psr: Optional[float] = None
+    roe: Optional[float] = None
+    dividend_yield: Optional[float] = None
+    rsi: Optional[float] = None
+    volatility: Optional[float] = None
+    return_30d: Optional[float] = None
+    updated_at: float
+
+
+class ScreenerResult(BaseModel):
+    """total: 테이블 전체 종목 수, matched: 조건에 맞는 종목 수 (items 는 limit 까지)."""
+    total: int
+    matched: int
+    items: List[ScreenerItem]
+
+
+class AlertCreate(BaseModel):
+    ticker: str
+    condition: str  # above: 가격 >= price 일 때 / below: 가격 <= price 일 때
+    price: float
+    client_id: str
+    webhook_url: Optional[str] = None
+    note: Optional[str] = None
+
+
+class AlertTargetsCreate(BaseModel):
+    """추천 목표가(매수/매도/손절) 알림 일괄 등록."""
+    client_id: str
+    webhook_url: Optional[str] = None
@@ -1,9 +1,16 @@
 // kobotPick/frontEnd/js/chart_renderer.js
 
+let chartResizeHandler = null; // 다시 그릴 때 이전 차트의 리사이즈 핸들러 제거용
+
 function renderCandleChart(ticker, historicalData) {
     const chartContainer = document.getElementById('chart-area');
     chartContainer.innerHTML = ''; // 초기화
 
+    // 컬럼 형식({t:[], o:[], ...}) 응답도 그대로 받을 수 있게 변환
+    if (historicalData && Array.isArray(historicalData.t)) {
+        historicalData = columnarToCandles(historicalData);
+    }
+
     if (!historicalData || historicalData.length === 0) {
         chartContainer.innerText = "차트 데이터를 불러올 수 없습니다.";
         return;
@@ -49,7 +56,32 @@ function renderCandleChart(ticker, historicalData) {
     chart.timeScale().scrollToPosition(-5, false); // 오른쪽 치우침 완화
 
     // 리사이즈 대응
-    window.addEventListener('resize', () => {
-        chart.applyOptions({ width: chartContainer.clientWidth });
-    });
+    if (chartResizeHandler) window.removeEventListener('resize', chartResizeHandler);
+    chartResizeHandler = () => chart.applyOptions({ width: chartContainer.clientWidth });
+    window.addEventListener('resize', chartResizeHandler);
+}
+
+// /candles 컬럼 응답 → 차트용 행 배열 (t 는 거래소 현지 날짜 기준 epoch 초)
+function columnarToCandles(cols) {
+    const out = new Array(cols.t.length);
+    for (let i = 0; i < cols.t.length; i++) {
+        out[i] = {
+            date: new Date(cols.t[i] * 1000).toISOString(),
+            open: cols.o[i],
+            high: cols.h[i],
+            low: cols.l[i],
+            close: cols.c[i],
+        };
+    }
+    return out;
+}
+
+// 장기 차트: 서버에서 다운샘플된 컬럼 데이터를 받아 렌더링 (예: range=5y, interval=1wk)
+async function loadCandleRange(apiBaseUrl, ticker, range = '1y', interval = '1d', points = 400) {
+    const params = new URLSearchParams({ range, interval, points: String(points) });
+    const res = await fetch(`${apiBaseUrl}/candles/${encodeURIComponent(ticker)}?${params}`);
+    if (!res.ok) throw new Error(`candles error ${res.status}`);
+    const cols = await res.json();
+    renderCandleChart(ticker, cols);
+    return cols;
 }
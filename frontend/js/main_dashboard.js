@@ -201,8 +201,12 @@ async function fetchPicksWithRec() {
 async function fetchWithTimeout(url, { timeout = REQUEST_TIMEOUT_MS, ...options } = {}) {
   const controller = new AbortController();
   const id = setTimeout(() => controller.abort(), timeout);
+  // 서버가 우리가 포기하기 전에 (일부는 캐시로 채워서라도) 응답하도록 시간 예산을 함께 보냄.
+  // 헤더 대신 쿼리를 써서 CORS preflight 를 피한다.
+  const budgetMs = Math.max(timeout - 1500, 1000);
+  const target = `${url}${url.includes("?") ? "&" : "?"}timeout_ms=${budgetMs}`;
   try {
-    return await fetch(url, { ...options, signal: controller.signal });
+    return await fetch(target, { ...options, signal: controller.signal });
   } finally {
     clearTimeout(id);
   }
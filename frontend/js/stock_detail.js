@@ -189,6 +189,29 @@ function renderData(data) {
     requestAnimationFrame(() =>
         renderCandleChart(data.ticker, data.historical)
     );
+    bindChartRange(data);
+}
+
+// 기간 선택: "최근"은 분석 응답의 차트, 1Y/5Y 는 /candles 의 다운샘플된 컬럼 응답
+function bindChartRange(data) {
+    const group = document.getElementById("chart-range");
+    if (!group) return;
+    group.onclick = async (e) => {
+        const btn = e.target.closest("button[data-range]");
+        if (!btn || btn.classList.contains("chip-primary")) return;
+        group.querySelectorAll("button").forEach((b) => b.classList.toggle("chip-primary", b === btn));
+        if (!btn.dataset.range) {
+            renderCandleChart(data.ticker, data.historical);
+            return;
+        }
+        try {
+            await loadCandleRange(API_BASE_URL, data.ticker, btn.dataset.range, btn.dataset.interval, 400);
+        } catch (err) {
+            console.error(err);
+            group.querySelectorAll("button").forEach((b) => b.classList.toggle("chip-primary", !b.dataset.range));
+            renderCandleChart(data.ticker, data.historical);
+        }
+    };
 }
 
 function renderFundamentals(fundamentals) {